@@ -1,22 +1,102 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.rules.validation_file_size_type import validate_file_size_type  # type: ignore
-from app.services.s3_service import S3Service
-from app.utils.ocr import read_image  # type: ignore
+from app.rules.validation_file_size_type import validate_file_headers, validate_file_size_type
+from app.services.s3_service import s3_service
+from app.utils.ocr import read_image_bytes
 from app.utils.media_utils import MediaManager
-from app.schemas.extraction_result import ExtractionResult  # type: ignore
-from app.core.database_session import get_db
-import tempfile
+from app.utils.cache import BoundedCache
+from app.schemas.extraction_result import ExtractionResult, OCRBatchUploadItem, OCRJobQueued, OCRJobStatus, OCRJobStatusBatch, OCRJobResult
+from app.schemas.media import PresignedUploadRequest, PresignedUpload, UploadComplete
+from app.core.database_session import SessionLocal, get_db
+from app.core.config import get_config
+from app.core.celery_app import celery_app
+from app.models.media import Media
+from app.models.ocr_job import OCRJob
+from app.tasks.ocr_tasks import process_ocr_image
+from celery import states
+from celery.backends.base import KeyValueStoreBackend
+from celery.result import AsyncResult
+from app.core.redis_client import redis_manager
+from app.core.logging_config import get_logger
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
 import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import timedelta
 
 router = APIRouter()
-s3_service = S3Service()
+logger = get_logger(__name__)
 
-@router.post("/upload-identity-document/", response_model=ExtractionResult)
-async def upload_identity_document(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-):
+# OCR output is cached by the SHA-256 of the uploaded file for one day
+OCR_CACHE_TTL = 24 * 60 * 60
+
+# Lifetime of presigned direct-upload forms, in seconds
+PRESIGNED_UPLOAD_TTL = 15 * 60
+
+# Upper bound on job ids accepted by the batch status endpoint
+MAX_BATCH_JOB_IDS = 100
+
+# Batch uploads: files accepted per request and S3 uploads in flight at once
+MAX_BATCH_UPLOAD_FILES = 20
+BATCH_UPLOAD_CONCURRENCY = 8
+
+# Finished (SUCCESS/FAILURE) job statuses never change, so they are kept in
+# process for as long as the result backend keeps them; None keeps them
+# until evicted
+_result_expires = celery_app.conf.result_expires
+FINISHED_JOB_CACHE_TTL = (
+    _result_expires.total_seconds() if isinstance(_result_expires, timedelta) else _result_expires
+)
+FINISHED_JOB_CACHE_SIZE = 10000
+
+# job_id -> (status, expires_at or None)
+_finished_jobs = BoundedCache(FINISHED_JOB_CACHE_SIZE)
+
+
+async def get_cached_ocr_text(file_hash: str) -> Optional[str]:
+    """Return previously extracted text for a file hash, if cached"""
+    try:
+        return await redis_manager.get(f"ocr:{file_hash}")
+    except Exception as e:
+        logger.warning(f"OCR cache lookup failed for {file_hash}: {e}")
+        return None
+
+
+async def cache_ocr_text(file_hash: str, text: str) -> None:
+    """Store extracted text for a file hash"""
+    try:
+        await redis_manager.set(f"ocr:{file_hash}", text, ex=OCR_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"OCR cache store failed for {file_hash}: {e}")
+
+
+def save_upload_media(db: Session, upload_result: Dict[str, Any]) -> Media:
+    """Record the media metadata of a file stored in S3"""
+    try:
+        return MediaManager.create_media(
+            db=db,
+            name=upload_result['original_filename'],
+            file_name=upload_result['key'],
+            disk="s3",
+            mime_type=upload_result['content_type'],
+            size=upload_result['size'],
+            hash=upload_result['hash'],
+            custom_attribute="uploaded_via_api"
+        )
+    except Exception as e:
+        # Leave the session usable for the other files of a batch upload
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save media metadata: {str(e)}")
+
+
+async def store_upload(file: UploadFile, db: Session) -> Tuple[str, str, Dict[str, Any], Media, bytes]:
+    """Validate an upload, store it in S3 and record its media metadata"""
     # Validate and read file content
     content = await validate_file_size_type(file)
     if not content:
@@ -26,46 +106,99 @@ async def upload_identity_document(
     filename = file.filename if file.filename is not None else ""
     content_type = file.content_type if file.content_type is not None else ""
 
+    # The S3 key is derived from the content hash, so a file we already hold
+    # is neither uploaded again nor given a second media record. Only rows
+    # stored under that server-derived key are reused: the hash column alone
+    # is no proof of what the object holds.
+    file_hash = hashlib.sha256(content).hexdigest()
+    _, ext = os.path.splitext(filename)
+    existing = MediaManager.get_media_by_file_name(db, f"uploads/{file_hash}{ext}")
+    if existing is not None:
+        upload_result = {
+            'key': existing.file_name,
+            'url': s3_service.object_url(existing.file_name),
+            'hash': file_hash,
+            'size': existing.size,
+            'original_filename': existing.name,
+            'content_type': existing.mime_type
+        }
+        return filename, content_type, upload_result, existing, content
+
     # Upload to S3/MinIO
     try:
-        upload_result = s3_service.upload_file(
+        upload_result = await run_in_threadpool(
+            s3_service.upload_file,
             file_content=content,
             file_name=filename,
-            content_type=content_type
+            content_type=content_type,
+            file_hash=file_hash
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"S3 upload failed: {str(e)}")
 
-    # Save media metadata to DB
+    media = save_upload_media(db, upload_result)
+
+    return filename, content_type, upload_result, media, content
+
+
+async def store_upload_stream(file: UploadFile, db: Session) -> Media:
+    """
+    Validate an upload and stream it to S3 without reading it into memory
+
+    The spooled upload file is hashed and sent to S3 in chunks, so memory
+    use does not grow with the file size.
+    """
+    validate_file_headers(file)
+
+    filename = file.filename if file.filename is not None else ""
+    content_type = file.content_type if file.content_type is not None else ""
+
     try:
-        media = MediaManager.create_media(
-            db=db,
-            name=upload_result['original_filename'],
-            file_name=upload_result['key'],
-            disk="s3",
-            mime_type=upload_result['content_type'],
-            size=upload_result['size'],
-            hash=upload_result['hash'],
-            custom_attribute="uploaded_via_api"
+        upload_result = await run_in_threadpool(
+            s3_service.upload_stream,
+            file.file,
+            filename,
+            content_type,
+            get_config().max_file_size
         )
+    except ValueError:
+        raise HTTPException(status_code=413, detail="File too large")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save media metadata: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"S3 upload failed: {str(e)}")
+
+    if not upload_result['size']:
+        raise HTTPException(status_code=400, detail="Invalid file or empty content.")
+
+    return save_upload_media(db, upload_result)
+
 
-    # Download from S3 to temp file for OCR
+@router.post("/upload-identity-document/", response_model=ExtractionResult)
+async def upload_identity_document(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    filename, content_type, upload_result, media, content = await store_upload(file, db)
+
+    # Identical files share a hash, so their OCR output can be reused
+    cached_text = await get_cached_ocr_text(upload_result['hash'])
+    if cached_text is not None:
+        return ExtractionResult(
+            filename=filename,
+            content_type=content_type,
+            s3_url=upload_result['url'],
+            media_id=str(media.id),
+            result=cached_text
+        )
+
+    # OCR the bytes already in memory rather than re-downloading them from S3;
+    # Tesseract is blocking, so keep it off the event loop
     try:
-        # type: ignore for os.path.splitext if needed
-        _, ext = os.path.splitext(str(filename))  # type: ignore
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp_file:
-            s3_file_content = s3_service.download_file(upload_result['key'])
-            temp_file.write(s3_file_content)
-            temp_file_path = temp_file.name
-        ocr = read_image(temp_file_path)
+        ocr = await run_in_threadpool(read_image_bytes, content)
         extracted_text = ocr.output()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OCR failed: {str(e)}")
-    finally:
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+
+    await cache_ocr_text(upload_result['hash'], extracted_text)
 
     return ExtractionResult(
         filename=filename,
@@ -73,4 +206,319 @@ async def upload_identity_document(
         s3_url=upload_result['url'],
         media_id=str(media.id),
         result=extracted_text
-    )
\ No newline at end of file
+    )
+
+
+def spool_upload(file: UploadFile) -> str:
+    """Copy an upload to a named temp file that outlives the request"""
+    _, ext = os.path.splitext(file.filename or "")
+    file.file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp_file:
+        shutil.copyfileobj(file.file, temp_file)
+        return temp_file.name
+
+
+def store_spooled_upload_and_enqueue(temp_path: str, filename: str, content_type: str, task_id: str) -> None:
+    """
+    Background step of the async upload: store a spooled file and queue its OCR
+
+    Any failure is recorded against the pre-generated task id so clients
+    polling /jobs/{task_id} see FAILURE instead of a job that stays PENDING.
+    """
+    db = SessionLocal()
+    try:
+        with open(temp_path, "rb") as fileobj:
+            upload_result = s3_service.upload_stream(
+                fileobj, filename, content_type, get_config().max_file_size
+            )
+        if not upload_result['size']:
+            raise ValueError("Invalid file or empty content.")
+
+        media = save_upload_media(db, upload_result)
+        process_ocr_image.apply_async(args=[str(media.id)], task_id=task_id)
+    except Exception as e:
+        logger.error(f"Async upload {task_id} failed: {e}")
+        celery_app.backend.mark_as_failure(task_id, e)
+    finally:
+        db.close()
+        os.unlink(temp_path)
+
+
+@router.post("/upload-identity-document/async", response_model=OCRJobQueued, status_code=202)
+async def upload_identity_document_async(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...)
+):
+    """
+    Accept an upload and queue OCR on a Celery worker instead of running it in the request
+
+    The response is sent as soon as the file is spooled; the S3 upload,
+    media record and OCR enqueue happen in a background task under a
+    pre-generated job id. The media id is reported in the job result.
+    """
+    validate_file_headers(file)
+
+    filename = file.filename if file.filename is not None else ""
+    content_type = file.content_type if file.content_type is not None else ""
+
+    temp_path = await run_in_threadpool(spool_upload, file)
+    task_id = str(uuid.uuid4())
+    background_tasks.add_task(store_spooled_upload_and_enqueue, temp_path, filename, content_type, task_id)
+
+    return OCRJobQueued(
+        job_id=task_id,
+        status_url=f"/jobs/{task_id}"
+    )
+
+
+@router.post("/upload-identity-documents/async", response_model=List[OCRBatchUploadItem], status_code=202)
+async def upload_identity_documents_async(
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Store several uploads concurrently and queue OCR for each of them
+
+    A file that fails to upload does not fail the batch: every file gets
+    its own entry, queued with a job id or failed with the error.
+    """
+    if len(files) > MAX_BATCH_UPLOAD_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_UPLOAD_FILES} files per request")
+
+    # Reject the whole batch before anything is uploaded
+    for file in files:
+        validate_file_headers(file)
+
+    semaphore = asyncio.Semaphore(BATCH_UPLOAD_CONCURRENCY)
+
+    async def store(file: UploadFile) -> Media:
+        async with semaphore:
+            return await store_upload_stream(file, db)
+
+    outcomes = await asyncio.gather(*(store(file) for file in files), return_exceptions=True)
+
+    items = []
+    for file, outcome in zip(files, outcomes):
+        filename = file.filename if file.filename is not None else ""
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            error = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+            items.append(OCRBatchUploadItem(filename=filename, status="failed", error=error))
+            continue
+
+        try:
+            task = process_ocr_image.delay(str(outcome.id))
+        except Exception as e:
+            logger.error(f"Failed to queue OCR for media {outcome.id}: {e}")
+            items.append(OCRBatchUploadItem(
+                filename=filename,
+                status="failed",
+                media_id=str(outcome.id),
+                error=f"Failed to queue OCR: {str(e)}"
+            ))
+            continue
+
+        items.append(OCRBatchUploadItem(
+            filename=filename,
+            status="queued",
+            job_id=task.id,
+            media_id=str(outcome.id),
+            status_url=f"/jobs/{task.id}"
+        ))
+    return items
+
+
+@router.post("/upload-identity-document/presign", response_model=PresignedUpload)
+async def presign_identity_document_upload(request: PresignedUploadRequest):
+    """Return a presigned form so the client uploads the file straight to S3"""
+    config = get_config()
+    if request.content_type not in config.allowed_file_types:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {request.content_type}")
+
+    _, ext = os.path.splitext(request.filename)
+    key = f"uploads/{uuid.uuid4().hex}{ext}"
+
+    presigned = await run_in_threadpool(
+        s3_service.generate_presigned_post,
+        key,
+        request.content_type,
+        config.max_file_size,
+        expiration=PRESIGNED_UPLOAD_TTL
+    )
+    if presigned is None:
+        raise HTTPException(status_code=500, detail="Failed to generate upload URL")
+
+    return PresignedUpload(
+        upload_url=presigned['url'],
+        key=key,
+        fields=presigned['fields'],
+        expires_in=PRESIGNED_UPLOAD_TTL
+    )
+
+
+@router.post("/upload-identity-document/complete", response_model=OCRJobQueued, status_code=202)
+async def complete_identity_document_upload(
+    request: UploadComplete,
+    db: Session = Depends(get_db)
+):
+    """Record a file the client uploaded with a presigned form and queue its OCR"""
+    if not request.key.startswith("uploads/"):
+        raise HTTPException(status_code=400, detail="Invalid upload key")
+
+    # A key is completed once; repeats would add media rows and OCR jobs
+    if MediaManager.get_media_by_file_name(db, request.key) is not None:
+        raise HTTPException(status_code=409, detail="Upload already completed")
+
+    # Size and type come from S3, not from the client
+    metadata = await run_in_threadpool(s3_service.get_file_metadata, request.key)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Uploaded file not found")
+
+    config = get_config()
+    if metadata['content_type'] not in config.allowed_file_types:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {metadata['content_type']}")
+    if not metadata['content_length']:
+        raise HTTPException(status_code=400, detail="Invalid file or empty content.")
+    if metadata['content_length'] > config.max_file_size:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    media = save_upload_media(db, {
+        'original_filename': request.filename or os.path.basename(request.key),
+        'key': request.key,
+        'content_type': metadata['content_type'],
+        'size': metadata['content_length'],
+        # The client can rewrite the object until its form expires, so no
+        # content hash is recorded and the row never takes part in dedup
+        'hash': None
+    })
+
+    task = process_ocr_image.delay(str(media.id))
+
+    return OCRJobQueued(
+        job_id=task.id,
+        media_id=str(media.id),
+        status_url=f"/jobs/{task.id}"
+    )
+
+
+def job_status(job_id: str, state: str, result: Any) -> OCRJobStatus:
+    """Build the status payload for a Celery task state and result/meta"""
+    if state == states.SUCCESS:
+        return OCRJobStatus(job_id=job_id, status=state, result=result)
+    if state == states.FAILURE:
+        return OCRJobStatus(job_id=job_id, status=state, error=str(result))
+    return OCRJobStatus(job_id=job_id, status=state, result=result if isinstance(result, dict) else None)
+
+
+def _get_finished_job(job_id: str, now: float) -> Optional[OCRJobStatus]:
+    """Return the cached status of a finished job, if still fresh"""
+    cached = _finished_jobs.get(job_id)
+    if cached is not None and (cached[1] is None or cached[1] > now):
+        return cached[0]
+    return None
+
+
+def _cache_finished_job(status: OCRJobStatus, now: float) -> None:
+    """Remember the status of a job that reached SUCCESS or FAILURE"""
+    if status.status not in (states.SUCCESS, states.FAILURE):
+        return
+    expires_at = now + FINISHED_JOB_CACHE_TTL if FINISHED_JOB_CACHE_TTL is not None else None
+    _finished_jobs.set(status.job_id, (status, expires_at))
+
+
+def _read_job_statuses(job_ids: List[str]) -> List[OCRJobStatus]:
+    """Read task states from the result backend"""
+    backend = celery_app.backend
+    if not isinstance(backend, KeyValueStoreBackend):
+        statuses = []
+        for job_id in job_ids:
+            task = AsyncResult(job_id, app=celery_app)
+            statuses.append(job_status(job_id, task.state, task.result))
+        return statuses
+
+    values = backend.mget([backend.get_key_for_task(job_id) for job_id in job_ids])
+    statuses = []
+    for job_id, value in zip(job_ids, values):
+        if value is None:
+            statuses.append(job_status(job_id, states.PENDING, None))
+        else:
+            meta = backend.decode_result(value)
+            statuses.append(job_status(job_id, meta['status'], meta['result']))
+    return statuses
+
+
+def fetch_job_statuses(job_ids: List[str]) -> List[OCRJobStatus]:
+    """
+    Look up many task states with at most one backend round trip
+
+    Finished jobs are answered from an in-process cache. The rest are read
+    from key-value result backends such as Redis with a single MGET; other
+    backends fall back to one AsyncResult lookup per task.
+    """
+    now = time.monotonic()
+    statuses: Dict[str, OCRJobStatus] = {}
+    pending = []
+    for job_id in job_ids:
+        cached = _get_finished_job(job_id, now)
+        if cached is not None:
+            statuses[job_id] = cached
+        elif job_id not in pending:
+            pending.append(job_id)
+
+    if pending:
+        for status in _read_job_statuses(pending):
+            _cache_finished_job(status, now)
+            statuses[status.job_id] = status
+
+    return [statuses[job_id] for job_id in job_ids]
+
+
+@router.get("/jobs/{job_id}", response_model=OCRJobStatus)
+async def get_ocr_job_status(job_id: str):
+    """Poll the state of a queued OCR job"""
+    statuses = await run_in_threadpool(fetch_job_statuses, [job_id])
+    return statuses[0]
+
+
+@router.post("/jobs/batch", response_model=List[OCRJobStatus])
+async def get_ocr_job_statuses(request: OCRJobStatusBatch):
+    """Poll the state of several queued OCR jobs in one request"""
+    if len(request.job_ids) > MAX_BATCH_JOB_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_JOB_IDS} job ids per request")
+    return await run_in_threadpool(fetch_job_statuses, request.job_ids)
+
+
+@router.get("/media/{media_id}/ocr-results", response_model=List[OCRJobResult])
+async def get_media_ocr_results(
+    media_id: uuid.UUID,
+    include_output: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    List the OCR jobs run for a media item, newest first
+
+    Rows are read as plain column mappings rather than ORM instances; the
+    output_data JSON is only selected when ``include_output`` is set.
+    """
+    media = db.get(Media, media_id)
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    columns = [
+        OCRJob.id,
+        OCRJob.job_status,
+        OCRJob.created_at,
+        OCRJob.updated_at,
+        OCRJob.processing_time_ms,
+        OCRJob.error_message,
+    ]
+    if include_output:
+        columns.append(OCRJob.output_data)
+
+    stmt = (
+        select(*columns)
+        .where(OCRJob.input_file_path == media.file_name)
+        .order_by(OCRJob.created_at.desc())
+    )
+    return db.execute(stmt).mappings().all()
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, joinedload
 from typing import Optional
 from app.services.people_service import people_service
@@ -219,7 +220,9 @@ async def generate_ektp_image(
     # Upload to S3 using bytes
     buffer.seek(0)
     file_bytes = buffer.getvalue()
-    s3_result = s3_service.upload_file(file_bytes, f"ektp_{person.citizenship_identity}.png", content_type="image/png")
+    s3_result = await run_in_threadpool(
+        s3_service.upload_file, file_bytes, f"ektp_{person.citizenship_identity}.png", content_type="image/png"
+    )
     s3_key = s3_result['key']
     s3_url = s3_result['url']
     # Save metadata to media table
@@ -13,6 +13,8 @@ class DatabaseConfig(BaseSettings):
     database: str = Field(default="ocr_identity_db")
     pool_size: int = Field(default=10)
     max_overflow: int = Field(default=20)
+    pool_recycle: int = Field(default=1800)  # seconds
+    query_cache_size: int = Field(default=1200)
     echo: bool = Field(default=False)
     
     @property
@@ -155,6 +157,25 @@ class AppConfig(BaseSettings):
     max_file_size: int = Field(default=10 * 1024 * 1024)  # 10MB
     allowed_file_types: list = Field(default=["image/jpeg", "image/png", "image/jpg"])
     
+    # Grayscale + adaptive thresholding in OpenCV before recognition, so
+    # Tesseract gets a small binary image instead of binarizing it itself
+    ocr_preprocess: bool = Field(default=True)
+    
+    # Tesseract API instances kept per process and language. An instance is
+    # not thread safe, so this bounds how many images of one language are
+    # recognised concurrently.
+    tesseract_pool_size: int = Field(default=1)
+    
+    # Texts shorter than this (after stripping) cannot hold a 16 digit NIK
+    # and skip NER entirely
+    min_extract_len: int = Field(default=16)
+    
+    # spaCy extraction. The rule-only pipeline is the default; USE_STATISTICAL_NER
+    # loads the statistical model as well, which adds PERSON entities for names
+    use_statistical_ner: bool = Field(default=False)
+    spacy_batch_size: int = Field(default=32)  # documents per nlp.pipe batch
+    spacy_enabled_pipes: str = Field(default="")  # comma-separated, kept enabled on load
+    
     # Auth method
     auth_method: str = Field(default="jwt")
     
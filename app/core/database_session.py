@@ -30,7 +30,8 @@ class MultiDatabaseManager:
                 max_overflow=config.max_overflow,
                 echo=config.echo,
                 pool_pre_ping=True,
-                pool_recycle=3600
+                pool_recycle=config.pool_recycle,
+                query_cache_size=config.query_cache_size
             )
             
             self._engines[database_name] = engine
@@ -118,6 +119,11 @@ def create_database_engine(database_name: str = "default"):
     return multi_db_manager.get_engine(database_name)
 
 
+def warm_up_pool(database_name: str = "default") -> None:
+    """Open one pooled connection so the first request skips the handshake"""
+    multi_db_manager.get_engine(database_name).connect().close()
+
+
 def create_session_factory(database_name: str = "default"):
     """Create session factory for specific database"""
     return multi_db_manager.get_session_factory(database_name)
@@ -1,3 +1,4 @@
+import logging
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -6,6 +7,8 @@ from email import encoders
 from typing import Optional, List, Dict, Any
 from .config import get_email_config
 
+logger = logging.getLogger(__name__)
+
 
 class EmailManager:
     """Email client manager using aiosmtplib"""
@@ -78,7 +81,7 @@ class EmailManager:
             return True
             
         except Exception as e:
-            print(f"Error sending email: {e}")
+            logger.error(f"Error sending email: {e}")
             return False
     
     async def send_simple_email(
@@ -170,7 +173,7 @@ class EmailManager:
             return True
             
         except Exception as e:
-            print(f"Email connection test failed: {e}")
+            logger.error(f"Email connection test failed: {e}")
             return False
 
 
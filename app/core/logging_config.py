@@ -1,12 +1,16 @@
 """
 Logging configuration for OCR Identity REST API
 """
+import functools
 import os
 import sys
+import atexit
 import logging
 import logging.config
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from app.core.config import get_config
 
@@ -18,6 +22,7 @@ class LoggingConfig:
         self.config = get_config()
         self.log_dir = Path("logs")
         self.log_dir.mkdir(exist_ok=True)
+        self._listeners: List[QueueListener] = []
     
     def get_logging_config(self) -> Dict[str, Any]:
         """Get logging configuration dictionary"""
@@ -181,6 +186,7 @@ class LoggingConfig:
         try:
             config = self.get_logging_config()
             logging.config.dictConfig(config)
+            self._use_queue_handlers(config["loggers"].keys())
             
             # Get root logger
             logger = logging.getLogger()
@@ -199,13 +205,48 @@ class LoggingConfig:
             )
             logging.error(f"Failed to setup logging configuration: {e}")
 
+    
+    def _use_queue_handlers(self, logger_names) -> None:
+        """
+        Move handler I/O onto background threads
+        
+        Each configured logger's handlers are swapped for a QueueHandler, and
+        a QueueListener thread per distinct handler set does the actual
+        console and file writes, so logging calls never block on I/O.
+        """
+        self.stop_listeners()
+        queue_handlers: Dict[tuple, QueueHandler] = {}
+        
+        for name in logger_names:
+            logger = logging.getLogger(name)
+            handlers = tuple(logger.handlers)
+            if not handlers:
+                continue
+            
+            if handlers not in queue_handlers:
+                log_queue = queue.SimpleQueue()
+                listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+                listener.start()
+                self._listeners.append(listener)
+                queue_handlers[handlers] = QueueHandler(log_queue)
+            
+            logger.handlers = [queue_handlers[handlers]]
+    
+    def stop_listeners(self) -> None:
+        """Flush queued records and stop the listener threads"""
+        for listener in self._listeners:
+            listener.stop()
+        self._listeners.clear()
+
 
 # Global logging config instance
 logging_config = LoggingConfig()
+atexit.register(logging_config.stop_listeners)
 
 
+@functools.lru_cache(maxsize=None)
 def setup_logging():
-    """Setup logging configuration"""
+    """Setup logging configuration; later calls are no-ops"""
     logging_config.setup_logging()
 
 
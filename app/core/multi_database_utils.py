@@ -2,7 +2,8 @@
 Multi-database utilities and management functions
 """
 import asyncio
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.core.config import get_multi_database_config, get_database_config
@@ -17,16 +18,22 @@ class MultiDatabaseUtils:
         self.config = get_multi_database_config()
         self.router = get_database_router()
     
+    def _run_per_database(self, func: Callable[[str], Any], databases: List[str]) -> Dict[str, Any]:
+        """Call func for every database concurrently, keeping the given order"""
+        if not databases:
+            return {}
+        
+        # Each call is one independent network round trip per database
+        with ThreadPoolExecutor(max_workers=len(databases)) as executor:
+            return dict(zip(databases, executor.map(func, databases)))
+    
     def get_configured_databases(self) -> List[str]:
         """Get list of configured database names"""
-        databases = []
         all_dbs = self.config.get_all_databases()
+        candidates = [db_name for db_name, db_config in all_dbs.items() if db_config]
+        accessible = self._run_per_database(self._is_database_accessible, candidates)
         
-        for db_name, db_config in all_dbs.items():
-            if db_config and self._is_database_accessible(db_name):
-                databases.append(db_name)
-        
-        return databases
+        return [db_name for db_name in candidates if accessible[db_name]]
     
     def _is_database_accessible(self, database_name: str) -> bool:
         """Check if database is accessible"""
@@ -67,13 +74,7 @@ class MultiDatabaseUtils:
     
     def health_check_all_databases(self) -> Dict[str, Dict[str, Any]]:
         """Perform health check on all configured databases"""
-        results = {}
-        databases = self.get_configured_databases()
-        
-        for db_name in databases:
-            results[db_name] = self.health_check_database(db_name)
-        
-        return results
+        return self._run_per_database(self.health_check_database, self.get_configured_databases())
     
     def get_database_stats(self, database_name: str) -> Dict[str, Any]:
         """Get statistics for specific database"""
@@ -107,13 +108,7 @@ class MultiDatabaseUtils:
     
     def get_all_database_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all databases"""
-        stats = {}
-        databases = self.get_configured_databases()
-        
-        for db_name in databases:
-            stats[db_name] = self.get_database_stats(db_name)
-        
-        return stats
+        return self._run_per_database(self.get_database_stats, self.get_configured_databases())
     
     def get_models_by_database(self) -> Dict[str, List[str]]:
         """Get models grouped by database"""
@@ -139,16 +134,13 @@ class MultiDatabaseUtils:
     
     def execute_on_all_databases(self, query: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Execute query on all databases"""
-        results = {}
-        databases = self.get_configured_databases()
-        
-        for db_name in databases:
+        def execute(db_name: str) -> Any:
             try:
-                results[db_name] = self.execute_on_database(db_name, query, params)
+                return self.execute_on_database(db_name, query, params)
             except Exception as e:
-                results[db_name] = {"error": str(e)}
+                return {"error": str(e)}
         
-        return results
+        return self._run_per_database(execute, self.get_configured_databases())
     
     def backup_database_info(self) -> Dict[str, Any]:
         """Get backup information for all databases"""
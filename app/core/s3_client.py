@@ -1,9 +1,12 @@
+import logging
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 from typing import Optional, BinaryIO, Dict, Any
 import io
 from .config import get_s3_config
 
+logger = logging.getLogger(__name__)
+
 
 class S3Manager:
     """AWS S3 connection manager"""
@@ -69,7 +72,7 @@ class S3Manager:
             )
             return True
         except (ClientError, NoCredentialsError) as e:
-            print(f"Error uploading file to S3: {e}")
+            logger.error(f"Error uploading file to S3: {e}")
             return False
     
     def upload_fileobj(self, file_obj: BinaryIO, s3_key: str, content_type: Optional[str] = None) -> bool:
@@ -88,7 +91,7 @@ class S3Manager:
             )
             return True
         except (ClientError, NoCredentialsError) as e:
-            print(f"Error uploading file object to S3: {e}")
+            logger.error(f"Error uploading file object to S3: {e}")
             return False
     
     def download_file(self, s3_key: str, local_path: str) -> bool:
@@ -102,7 +105,7 @@ class S3Manager:
             )
             return True
         except (ClientError, NoCredentialsError) as e:
-            print(f"Error downloading file from S3: {e}")
+            logger.error(f"Error downloading file from S3: {e}")
             return False
     
     def get_file_url(self, s3_key: str, expires_in: int = 3600) -> Optional[str]:
@@ -119,7 +122,7 @@ class S3Manager:
             )
             return url
         except (ClientError, NoCredentialsError) as e:
-            print(f"Error generating presigned URL: {e}")
+            logger.error(f"Error generating presigned URL: {e}")
             return None
     
     def delete_file(self, s3_key: str) -> bool:
@@ -132,7 +135,7 @@ class S3Manager:
             )
             return True
         except (ClientError, NoCredentialsError) as e:
-            print(f"Error deleting file from S3: {e}")
+            logger.error(f"Error deleting file from S3: {e}")
             return False
     
     def file_exists(self, s3_key: str) -> bool:
@@ -158,7 +161,7 @@ class S3Manager:
             )
             return [obj['Key'] for obj in response.get('Contents', [])]
         except (ClientError, NoCredentialsError) as e:
-            print(f"Error listing files from S3: {e}")
+            logger.error(f"Error listing files from S3: {e}")
             return []
 
 
@@ -1,6 +1,7 @@
 """
 Sentry configuration for error monitoring and performance tracking
 """
+import functools
 import os
 import logging
 from typing import Optional, Dict, Any
@@ -206,8 +207,9 @@ class SentryConfig:
 sentry_config = SentryConfig()
 
 
+@functools.lru_cache(maxsize=None)
 def init_sentry():
-    """Initialize Sentry"""
+    """Initialize Sentry; later calls are no-ops"""
     sentry_config.init_sentry()
 
 
@@ -0,0 +1,123 @@
+"""
+Application factory for the OCR Identity REST API.
+"""
+
+import os
+import functools
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.middleware.cors import CORSMiddleware
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.util import get_remote_address
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
+from app.api.auth import router as auth_router
+from app.api.people import router as people_router
+from app.api.media import router as media_router
+from app.api.database import router as database_router
+from app.api.logging import router as logging_router
+from app.core.sentry import init_sentry
+from app.core.middleware.sentry_middleware import add_sentry_middleware
+from app.core.logging_config import setup_logging, get_logger
+from app.core.database_session import warm_up_pool
+from app.core.middleware.logging_middleware import add_logging_middleware
+from app.services.extract_text_identity import get_extractor
+from app.utils.ocr import init_tesseract_api
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the OCR and NER models and open a DB connection before the server accepts requests"""
+    try:
+        warm_up_pool()
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
+    init_tesseract_api()
+    extractor = get_extractor()
+    if extractor.spacy_service is not None:
+        # Run one document through the pipeline so the first request is not the cold one
+        extractor.spacy_service.extract_entities("NIK : 0000000000000000")
+    yield
+
+
+def rate_limit_exceeded_handler(request: Request, exc: Exception) -> Response:
+    return _rate_limit_exceeded_handler(request, exc)  # type: ignore
+
+
+async def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "version": "2.0.0",
+        "services": {
+            "database": "connected",
+            "redis": "connected",
+            "s3": "connected"
+        }
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    The assembled app is cached, so middleware, routers, Sentry and the
+    debugger are set up once per process however many times this is called.
+
+    Returns:
+        The configured FastAPI application
+    """
+    # Setup logging first
+    setup_logging()
+
+    app = FastAPI(
+        title="OCR Identity REST API",
+        version="2.0.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
+    )
+
+    # Initialize Sentry
+    init_sentry()
+
+    # Add Sentry middleware
+    add_sentry_middleware(app)
+
+    # Add logging middleware
+    add_logging_middleware(app)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Rate limiter
+    limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    app.add_middleware(SlowAPIMiddleware)
+
+    # Start debugpy if DEBUG environment variable is set
+    if os.getenv("DEBUG") == "1":
+        import debugpy
+        debugpy.listen((os.getenv("DEBUG_IP", "0.0.0.0"), 5678))
+        logger.info("Debugpy is listening on port 5678. Waiting for debugger to attach...")
+        debugpy.wait_for_client()
+
+    app.include_router(auth_router)
+    app.include_router(people_router)
+    app.include_router(media_router)
+    app.include_router(database_router)
+    app.include_router(logging_router)
+
+    app.add_api_route("/health", health_check, methods=["GET"])
+
+    return app
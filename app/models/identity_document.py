@@ -28,6 +28,9 @@ class IdentityDocument(Base):
     user = relationship("User", back_populates="identity_documents")
     ocr_jobs = relationship("OCRJob", back_populates="document", cascade="all, delete-orphan")
     
+    # Value stored in Mediable.mediable_type for this model
+    POLY_TYPE = "IdentityDocument"
+    
     # Polymorphic media relationships
     media_relationships = relationship("Mediable", 
                                     primaryjoin="and_(IdentityDocument.id==Mediable.mediable_id, "
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey, Text, DateTime, UniqueConstraint
+from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey, Text, DateTime, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -14,9 +14,9 @@ class Media(Base):
     id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     hash = Column(String(255), nullable=True)
-    file_name = Column(String(255), nullable=False)
+    file_name = Column(String(255), nullable=False, index=True)
     disk = Column(String(255), nullable=False)
-    mime_type = Column(String(255), nullable=False)
+    mime_type = Column(String(255), nullable=False, index=True)
     size = Column(Integer, nullable=False)
     record_left = Column(BigInteger, nullable=True, index=True)
     record_right = Column(BigInteger, nullable=True, index=True)
@@ -44,6 +44,8 @@ class Media(Base):
     
     __table_args__ = (
         UniqueConstraint('record_left', 'record_right', name='uq_media_nested_set'),
+        # Per-user listings only look at live media (migration 0010)
+        Index('ix_media_live_created_by', 'created_by', postgresql_where=text('deleted_at IS NULL')),
     )
 
     def add_child(self, db, child):
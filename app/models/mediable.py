@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -18,6 +18,11 @@ class Mediable(Base):
     # Relationships
     media = relationship("Media", back_populates="mediables")
     
+    __table_args__ = (
+        # Every MediaManager lookup filters on (mediable_type, mediable_id[, group])
+        Index('ix_mediables_type_id_group', 'mediable_type', 'mediable_id', 'group'),
+    )
+    
     def __repr__(self) -> str:
         return f"<Mediable(media_id={self.media_id}, mediable_type='{self.mediable_type}', mediable_id={self.mediable_id})>"
     
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -15,10 +15,15 @@ class OCRJob(Base):
     document_id = Column(PostgresUUID(as_uuid=True), ForeignKey("identity_documents.id", ondelete="CASCADE"), nullable=False)
     job_status = Column(String(50), default="pending", nullable=False)  # 'pending', 'processing', 'completed', 'failed'
     input_file_path = Column(String(500), nullable=True)
-    output_data = Column(JSONB, nullable=True)
+    output_data = Column(JSONB, nullable=True)  # lz4-compressed in TOAST (migration 0007)
     error_message = Column(Text, nullable=True)
     processing_time_ms = Column(Integer, nullable=True)
     
+    __table_args__ = (
+        # Per-media results listing: filter on input_file_path, newest first
+        Index('ix_ocr_jobs_input_file_created', 'input_file_path', text('created_at DESC')),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="ocr_jobs")
     document = relationship("IdentityDocument", back_populates="ocr_jobs")
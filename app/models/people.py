@@ -1,6 +1,6 @@
 import uuid
 from datetime import date
-from sqlalchemy import Column, String, Date, Integer, CheckConstraint, ForeignKey, DateTime
+from sqlalchemy import Column, String, Date, SmallInteger, CheckConstraint, ForeignKey, DateTime
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -33,7 +33,7 @@ class People(Base):
     
     # Personal status
     marital_status = Column(String(30), nullable=False, default='UNDEFINED')
-    disability_status = Column(Integer, nullable=False, default=0)
+    disability_status = Column(SmallInteger, nullable=False, default=0)
     job = Column(String(255), nullable=True)
     
     # Audit fields with UUID foreign keys
@@ -72,8 +72,8 @@ class People(Base):
             name='check_marital_status_valid'
         ),
         CheckConstraint(
-            "disability_status > 0",
-            name='check_disability_status_positive'
+            "disability_status >= 0",
+            name='check_disability_status_nonneg'
         ),
     )
     
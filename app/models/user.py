@@ -37,6 +37,9 @@ class User(Base):
     ocr_jobs = relationship("OCRJob", back_populates="user", cascade="all, delete-orphan")
     audit_logs = relationship("AuditLog", back_populates="user", cascade="all, delete-orphan")
     
+    # Value stored in Mediable.mediable_type for this model
+    POLY_TYPE = "User"
+    
     # Polymorphic media relationships
     media_relationships = relationship("Mediable", 
                                     primaryjoin="and_(User.id==Mediable.mediable_id, "
@@ -0,0 +1 @@
+# Validation rules package
@@ -0,0 +1,79 @@
+"""
+Upload validation rules
+"""
+from typing import Optional
+from fastapi import HTTPException, UploadFile
+from app.core.config import get_config
+
+# Bytes read from the upload per iteration
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes ("magic numbers") of the accepted image formats
+FILE_SIGNATURES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+}
+
+# Bytes read from the start of an upload to sniff its format
+SIGNATURE_SIZE = max(len(signature) for signature in FILE_SIGNATURES)
+
+
+def sniff_content_type(header: bytes) -> Optional[str]:
+    """Return the image MIME type matching the file's leading bytes, if any"""
+    for signature, content_type in FILE_SIGNATURES.items():
+        if header.startswith(signature):
+            return content_type
+    return None
+
+
+def validate_file_headers(file: UploadFile) -> None:
+    """
+    Validate an uploaded file's type and declared size without reading its body
+
+    Only the first few bytes are read, to check that the content really is
+    a JPEG or PNG whatever the client declared; the file is rewound after.
+
+    Args:
+        file: Uploaded file
+    """
+    config = get_config()
+
+    if file.content_type not in config.allowed_file_types:
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {file.content_type}")
+
+    if file.size is not None and file.size > config.max_file_size:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    header = file.file.read(SIGNATURE_SIZE)
+    file.file.seek(0)
+    # Empty uploads are reported by the callers as invalid content
+    if header and sniff_content_type(header) is None:
+        raise HTTPException(status_code=415, detail="File content is not a supported image")
+
+
+async def validate_file_size_type(file: UploadFile) -> bytes:
+    """
+    Validate an uploaded file's type and size and return its content
+
+    The type is checked before any of the body is read, and the body is
+    read in chunks so an oversized upload is rejected as soon as it crosses
+    the limit instead of after it has been buffered completely.
+
+    Args:
+        file: Uploaded file
+
+    Returns:
+        File content as bytes
+    """
+    config = get_config()
+    validate_file_headers(file)
+
+    chunks = []
+    total = 0
+    while chunk := await file.read(READ_CHUNK_SIZE):
+        total += len(chunk)
+        if total > config.max_file_size:
+            raise HTTPException(status_code=413, detail="File too large")
+        chunks.append(chunk)
+
+    return b"".join(chunks)
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+
+class ExtractionResult(BaseModel):
+    filename: str
+    content_type: str
+    s3_url: str
+    media_id: str
+    result: str
+
+class OCRJobQueued(BaseModel):
+    job_id: str
+    media_id: Optional[str] = None
+    status_url: str
+
+class OCRBatchUploadItem(BaseModel):
+    filename: str
+    status: str  # 'queued' or 'failed'
+    job_id: Optional[str] = None
+    media_id: Optional[str] = None
+    status_url: Optional[str] = None
+    error: Optional[str] = None
+
+class OCRJobStatus(BaseModel):
+    job_id: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+class OCRJobStatusBatch(BaseModel):
+    job_ids: List[str]
+
+class OCRJobResult(BaseModel):
+    id: Union[UUID, str]
+    job_status: str
+    created_at: Optional[Any] = None
+    updated_at: Optional[Any] = None
+    processing_time_ms: Optional[int] = None
+    error_message: Optional[str] = None
+    output_data: Optional[Dict[str, Any]] = None
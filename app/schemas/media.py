@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -15,4 +15,17 @@ class MediaRead(BaseModel):
     updated_at: Optional[datetime]
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+class PresignedUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+
+class PresignedUpload(BaseModel):
+    upload_url: str
+    key: str
+    fields: Dict[str, str]
+    expires_in: int
+
+class UploadComplete(BaseModel):
+    key: str
+    filename: Optional[str] = None
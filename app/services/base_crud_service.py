@@ -29,7 +29,7 @@ class BaseCRUDService(Generic[ModelType]):
     
     def get(self, db: Session, id: Union[int, UUID]) -> Optional[ModelType]:
         """Get a record by ID"""
-        return db.query(self.model).filter(getattr(self.model, 'id') == id).first()
+        return db.get(self.model, id)
     
     def get_multi(
         self, 
@@ -132,4 +132,4 @@ class BaseCRUDService(Generic[ModelType]):
     
     def exists(self, db: Session, id: Union[int, UUID]) -> bool:
         """Check if a record exists"""
-        return db.query(self.model).filter(getattr(self.model, 'id') == id).first() is not None 
\ No newline at end of file
+        return db.get(self.model, id) is not None 
\ No newline at end of file
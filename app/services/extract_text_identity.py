@@ -6,9 +6,13 @@ structured information from Indonesian identity documents.
 
 import re
 import logging
-from typing import Dict, Any, Optional
+import functools
+import threading
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from app.core.config import get_config
+
 # Import the spaCy extraction service
 try:
     from app.services.spacy_extraction_service import (
@@ -22,10 +26,45 @@ except ImportError:
     IdentityDocumentData = None
     get_spacy_extraction_service = None
 
+# RE2 guarantees linear-time matching on untrusted OCR text; stdlib re is
+# used when the google-re2 bindings are not installed
+try:
+    import re2 as _re_linear
+except ImportError:
+    _re_linear = re
+
 logger = logging.getLogger(__name__)
 
+# Patterns used by the manual fallback extraction, compiled once at import.
+# Patterns using \s or lookaheads stay on stdlib re: RE2 has no lookaheads
+# and its \s is ASCII-only, which would change how Unicode spaces are handled.
+_RE_WS = re.compile(r'\s+')
+_RE_LINE = _re_linear.compile(r'[^\n]+')
+_RE_DATE = _re_linear.compile(r"([0-9]{2}\-[0-9]{2}\-[0-9]{4})")
+_RE_GENDER = _re_linear.compile("(LAKI-LAKI|LAKI|LELAKI|PEREMPUAN)")
+_RE_BLOOD = _re_linear.compile("(O|A|B|AB)")
+_RE_RTRW_SPLIT = re.compile(r'[/\s]+')
+
+# OCR confusables: '|' is an I in text, while letters misread inside a
+# numeric field such as the NIK fold back to digits
+_OCR_TEXT_FIXES = str.maketrans({'|': 'I'})
+_OCR_DIGIT_FIXES = str.maketrans('OoIl|', '00111')
+
+# Simple word to number mapping for Indonesian
+_NUMBER_WORDS = {
+    'satu': '1', 'dua': '2', 'tiga': '3', 'empat': '4', 'lima': '5',
+    'enam': '6', 'tujuh': '7', 'delapan': '8', 'sembilan': '9', 'sepuluh': '10'
+}
+# Substring matches (no word boundaries), like the str.replace calls it replaces
+_RE_NUMBER_WORD = _re_linear.compile("|".join(_NUMBER_WORDS))
 
-@dataclass
+
+def _replace_number_word(match: "re.Match[str]") -> str:
+    """Return the digit string for a matched number word."""
+    return _NUMBER_WORDS[match.group(0)]
+
+
+@dataclass(slots=True)
 class ExtractionResult:
     """Result of identity document extraction."""
     nik: Optional[str] = None
@@ -48,7 +87,7 @@ class ExtractionResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, excluding None values."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {k: getattr(self, k) for k in self.__slots__ if getattr(self, k) is not None}
 
 
 class IdentityDocumentExtractor:
@@ -59,6 +98,29 @@ class IdentityDocumentExtractor:
     Indonesian identity documents using Named Entity Recognition.
     """
     
+    # Line keyword -> handler method for the manual fallback, in priority order
+    _FIELD_HANDLERS = (
+        ("NIK", "_handle_nik"),
+        ("Nama", "_handle_nama"),
+        ("Tempat", "_handle_tempat"),
+        ("Darah", "_handle_darah"),
+        ("Alamat", "_handle_alamat"),
+        ("RTRW", "_handle_rtrw"),
+        ("Kecamatan", "_handle_kecamatan"),
+        ("Desa", "_handle_desa"),
+        ("Kewarganegaraan", "_handle_kewarganegaraan"),
+        ("Pekerjaan", "_handle_pekerjaan"),
+        ("Agama", "_handle_agama"),
+        ("Perkawinan", "_handle_perkawinan"),
+    )
+    
+    # One pass over a line finds every keyword it contains; the lookahead
+    # lets matches overlap so the result equals per-keyword `in` checks
+    _FIELD_KEYWORD_RE = re.compile(
+        "(?=(" + "|".join(re.escape(keyword) for keyword, _ in _FIELD_HANDLERS) + "))"
+    )
+    _FIELD_PRIORITY = {keyword: index for index, (keyword, _) in enumerate(_FIELD_HANDLERS)}
+    
     def __init__(self, model_name: str = "id_core_news_sm"):
         """
         Initialize the extractor.
@@ -68,6 +130,9 @@ class IdentityDocumentExtractor:
         """
         self.model_name = model_name
         self.spacy_service: Optional[SpacyExtractionService] = None
+        self._field_handlers = {
+            keyword: getattr(self, name) for keyword, name in self._FIELD_HANDLERS
+        }
         self._initialize_spacy_service()
     
     def _initialize_spacy_service(self) -> None:
@@ -93,6 +158,9 @@ class IdentityDocumentExtractor:
         Returns:
             ExtractionResult with extracted information
         """
+        if self._is_too_short(extracted_result):
+            return ExtractionResult(confidence=0.0, extraction_method="empty_input")
+        
         if self.spacy_service is not None:
             return self._extract_with_spacy(extracted_result)
         else:
@@ -114,25 +182,7 @@ class IdentityDocumentExtractor:
                 spacy_result = self.spacy_service.extract_entities(text)
             
             # Convert to our result format
-            result = ExtractionResult(
-                nik=spacy_result.nik,
-                nama=spacy_result.nama,
-                tempat_lahir=spacy_result.tempat_lahir,
-                tanggal_lahir=spacy_result.tanggal_lahir,
-                jenis_kelamin=spacy_result.jenis_kelamin,
-                golongan_darah=spacy_result.golongan_darah,
-                alamat=spacy_result.alamat,
-                rt=spacy_result.rt,
-                rw=spacy_result.rw,
-                kecamatan=spacy_result.kecamatan,
-                kelurahan_atau_desa=spacy_result.kelurahan_atau_desa,
-                kewarganegaraan=spacy_result.kewarganegaraan,
-                pekerjaan=spacy_result.pekerjaan,
-                agama=spacy_result.agama,
-                status_perkawinan=spacy_result.status_perkawinan,
-                confidence=0.85,  # spaCy NER typically has high confidence
-                extraction_method="spacy_ner"
-            )
+            result = self._from_spacy_result(spacy_result)
             
             logger.info(f"Successfully extracted data using spaCy NER: {result}")
             return result
@@ -142,6 +192,73 @@ class IdentityDocumentExtractor:
             # Fallback to manual extraction
             return self._extract_with_fallback(text)
     
+    def extract_batch(self, texts: List[str]) -> List[ExtractionResult]:
+        """
+        Extract structured information from several OCR texts at once.
+        
+        With spaCy available the texts go through a single batched
+        ``nlp.pipe`` pass; otherwise each text uses the manual fallback.
+        
+        Args:
+            texts: OCR-processed texts from identity documents
+            
+        Returns:
+            ExtractionResult objects in the same order as ``texts``
+        """
+        if self.spacy_service is None:
+            return [self.extract(text) for text in texts]
+        
+        # Only texts long enough to hold a NIK go through the model
+        results: List[Optional[ExtractionResult]] = [
+            ExtractionResult(confidence=0.0, extraction_method="empty_input")
+            if self._is_too_short(text) else None
+            for text in texts
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        try:
+            spacy_results = self.spacy_service.extract_entities_batch([texts[i] for i in pending])
+        except Exception as e:
+            logger.error(f"spaCy batch extraction failed: {e}")
+            spacy_results = None
+        
+        for position, i in enumerate(pending):
+            if spacy_results is None:
+                results[i] = self._extract_with_fallback(texts[i])
+            else:
+                results[i] = self._from_spacy_result(spacy_results[position])
+        
+        return results
+    
+    @staticmethod
+    def _is_too_short(text: Optional[str]) -> bool:
+        """Return True if the text is empty or shorter than the min_extract_len setting."""
+        return not text or len(text.strip()) < get_config().min_extract_len
+    
+    def _from_spacy_result(self, spacy_result: IdentityDocumentData) -> ExtractionResult:
+        """Convert spaCy service output to an ExtractionResult."""
+        return ExtractionResult(
+            nik=spacy_result.nik,
+            nama=spacy_result.nama,
+            tempat_lahir=spacy_result.tempat_lahir,
+            tanggal_lahir=spacy_result.tanggal_lahir,
+            jenis_kelamin=spacy_result.jenis_kelamin,
+            golongan_darah=spacy_result.golongan_darah,
+            alamat=spacy_result.alamat,
+            rt=spacy_result.rt,
+            rw=spacy_result.rw,
+            kecamatan=spacy_result.kecamatan,
+            kelurahan_atau_desa=spacy_result.kelurahan_atau_desa,
+            kewarganegaraan=spacy_result.kewarganegaraan,
+            pekerjaan=spacy_result.pekerjaan,
+            agama=spacy_result.agama,
+            status_perkawinan=spacy_result.status_perkawinan,
+            confidence=0.85,  # spaCy NER typically has high confidence
+            extraction_method="spacy_ner"
+        )
+    
     def _extract_with_fallback(self, text: str) -> ExtractionResult:
         """
         Fallback extraction using manual pattern matching.
@@ -158,120 +275,112 @@ class IdentityDocumentExtractor:
         # Clean and normalize text
         text = self._normalize_text(text)
         
-        # Extract information using manual patterns
-        for word in text.split("\n"):
-            word = word.strip()
+        # Extract information using manual patterns; the first keyword found
+        # (in _FIELD_HANDLERS order) decides which field a line fills
+        for line_match in _RE_LINE.finditer(text):
+            word = line_match.group(0).strip()
             if not word:
                 continue
-                
-            # Extract NIK
-            if "NIK" in word:
-                word_parts = word.split(':')
-                if len(word_parts) > 1:
-                    result.nik = self._extract_nik(word_parts[-1].replace(" ", ""))
-                continue
-
-            # Extract name
-            if "Nama" in word:
-                word_parts = word.split(':')
-                if len(word_parts) > 1:
-                    result.nama = word_parts[-1].replace('Nama ', '').replace('1', '').strip()
-                continue
-
-            # Extract birth place and date
-            if "Tempat" in word:
-                word_parts = word.split(':')
-                if len(word_parts) > 1:
-                    birth_text = word_parts[-1]
-                    date_match = re.search(r"([0-9]{2}\-[0-9]{2}\-[0-9]{4})", birth_text)
-                    if date_match:
-                        result.tanggal_lahir = date_match.group(1)
-                        if result.tanggal_lahir:
-                            result.tempat_lahir = birth_text.replace(result.tanggal_lahir, '').strip(', ')
-                continue
-
-            # Extract gender and blood type
-            if 'Darah' in word:
-                gender_match = re.search("(LAKI-LAKI|LAKI|LELAKI|PEREMPUAN)", word)
-                if gender_match:
-                    result.jenis_kelamin = gender_match.group(1)
-                
-                word_parts = word.split(':')
-                if len(word_parts) > 1:
-                    blood_match = re.search("(O|A|B|AB)", word_parts[-1])
-                    if blood_match:
-                        result.golongan_darah = blood_match.group(1)
-                    else:
-                        result.golongan_darah = '-'
-                continue
-                
-            # Extract address
-            if 'Alamat' in word:
-                result.alamat = self._word_to_number_converter(word).replace("Alamat ", "").strip()
-                continue
-                
-            # Extract RT/RW
-            if "RTRW" in word:
-                cleaned_string = word.replace("RTRW", '').strip()
-                parts = re.split(r'[/\s]+', cleaned_string)
-                if len(parts) == 2:
-                    result.rt = parts[0].strip()
-                    result.rw = parts[1].strip()
-                else:
-                    result.rt = "000"
-                    result.rw = "000"
-                continue
-                
-            # Extract kecamatan
-            if "Kecamatan" in word:
-                separator = '—' if '—' in word else ':'
-                word_parts = word.split(separator)
-                if len(word_parts) > 1:
-                    result.kecamatan = word_parts[1].strip()
-                continue
-                
-            # Extract desa/kelurahan
-            if "Desa" in word:
-                words = word.split()
-                desa_parts = []
-                for w in words:
-                    if not 'desa' in w.lower():
-                        desa_parts.append(w)
-                result.kelurahan_atau_desa = ''.join(desa_parts)
-                continue
-                
-            # Extract citizenship
-            if 'Kewarganegaraan' in word:
-                word_parts = word.split(':')
-                if len(word_parts) > 1:
-                    result.kewarganegaraan = word_parts[1].strip()
-                continue
-                
-            # Extract occupation
-            if 'Pekerjaan' in word:
-                words = word.split()
-                pekerjaan_parts = []
-                for w in words:
-                    if not '-' in w:
-                        pekerjaan_parts.append(w)
-                result.pekerjaan = ' '.join(pekerjaan_parts).replace('Pekerjaan', '').strip()
-                continue
-                
-            # Extract religion
-            if 'Agama' in word:
-                result.agama = word.replace('Agama', "").strip()
-                continue
-                
-            # Extract marital status
-            if 'Perkawinan' in word:
-                word_parts = word.split(':')
-                if len(word_parts) > 1:
-                    result.status_perkawinan = word_parts[1].strip()
-                continue
+            
+            keywords = self._FIELD_KEYWORD_RE.findall(word)
+            if keywords:
+                keyword = min(keywords, key=self._FIELD_PRIORITY.__getitem__)
+                self._field_handlers[keyword](word, result)
         
         logger.info(f"Extracted data using manual patterns: {result}")
         return result
     
+    def _handle_nik(self, word: str, result: ExtractionResult) -> None:
+        """Extract NIK"""
+        _, separator, tail = word.rpartition(':')
+        if separator:
+            result.nik = self._extract_nik(tail.translate(_OCR_DIGIT_FIXES))
+    
+    def _handle_nama(self, word: str, result: ExtractionResult) -> None:
+        """Extract name"""
+        _, separator, tail = word.rpartition(':')
+        if separator:
+            result.nama = tail.replace('Nama ', '').replace('1', '').strip()
+    
+    def _handle_tempat(self, word: str, result: ExtractionResult) -> None:
+        """Extract birth place and date"""
+        _, separator, birth_text = word.rpartition(':')
+        if separator:
+            date_match = _RE_DATE.search(birth_text)
+            if date_match:
+                result.tanggal_lahir = date_match.group(1)
+                if result.tanggal_lahir:
+                    result.tempat_lahir = birth_text.replace(result.tanggal_lahir, '').strip(', ')
+    
+    def _handle_darah(self, word: str, result: ExtractionResult) -> None:
+        """Extract gender and blood type"""
+        gender_match = _RE_GENDER.search(word)
+        if gender_match:
+            result.jenis_kelamin = gender_match.group(1)
+        
+        _, separator, tail = word.rpartition(':')
+        if separator:
+            blood_match = _RE_BLOOD.search(tail)
+            if blood_match:
+                result.golongan_darah = blood_match.group(1)
+            else:
+                result.golongan_darah = '-'
+    
+    def _handle_alamat(self, word: str, result: ExtractionResult) -> None:
+        """Extract address"""
+        result.alamat = self._word_to_number_converter(word).replace("Alamat ", "").strip()
+    
+    def _handle_rtrw(self, word: str, result: ExtractionResult) -> None:
+        """Extract RT/RW"""
+        cleaned_string = word.replace("RTRW", '').strip()
+        parts = _RE_RTRW_SPLIT.split(cleaned_string)
+        if len(parts) == 2:
+            result.rt = parts[0].strip()
+            result.rw = parts[1].strip()
+        else:
+            result.rt = "000"
+            result.rw = "000"
+    
+    def _handle_kecamatan(self, word: str, result: ExtractionResult) -> None:
+        """Extract kecamatan"""
+        _, separator, tail = word.partition('—' if '—' in word else ':')
+        if separator:
+            result.kecamatan = tail.partition(separator)[0].strip()
+    
+    def _handle_desa(self, word: str, result: ExtractionResult) -> None:
+        """Extract desa/kelurahan"""
+        words = word.split()
+        desa_parts = []
+        for w in words:
+            if not 'desa' in w.lower():
+                desa_parts.append(w)
+        result.kelurahan_atau_desa = ''.join(desa_parts)
+    
+    def _handle_kewarganegaraan(self, word: str, result: ExtractionResult) -> None:
+        """Extract citizenship"""
+        _, separator, tail = word.partition(':')
+        if separator:
+            result.kewarganegaraan = tail.partition(':')[0].strip()
+    
+    def _handle_pekerjaan(self, word: str, result: ExtractionResult) -> None:
+        """Extract occupation"""
+        words = word.split()
+        pekerjaan_parts = []
+        for w in words:
+            if not '-' in w:
+                pekerjaan_parts.append(w)
+        result.pekerjaan = ' '.join(pekerjaan_parts).replace('Pekerjaan', '').strip()
+    
+    def _handle_agama(self, word: str, result: ExtractionResult) -> None:
+        """Extract religion"""
+        result.agama = word.replace('Agama', "").strip()
+    
+    def _handle_perkawinan(self, word: str, result: ExtractionResult) -> None:
+        """Extract marital status"""
+        _, separator, tail = word.partition(':')
+        if separator:
+            result.status_perkawinan = tail.partition(':')[0].strip()
+    
     def _normalize_text(self, text: str) -> str:
         """
         Normalize text for better extraction.
@@ -283,11 +392,11 @@ class IdentityDocumentExtractor:
             Normalized text
         """
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _RE_WS.sub(' ', text.strip())
         
-        # Normalize common OCR errors
-        text = text.replace('|', 'I')
-        text = text.replace('0', 'O')  # In certain contexts
+        # Normalize common OCR errors; digit confusables are folded only
+        # inside numeric fields (see _handle_nik) so real zeros survive
+        text = text.translate(_OCR_TEXT_FIXES)
         
         # Normalize line breaks
         text = text.replace('\r\n', '\n').replace('\r', '\n')
@@ -304,8 +413,8 @@ class IdentityDocumentExtractor:
         Returns:
             Extracted NIK or None
         """
-        # Remove non-digit characters
-        nik = re.sub(r'[^\d]', '', text)
+        # Remove non-digit characters (str.isdecimal matches exactly what \d does)
+        nik = ''.join(filter(str.isdecimal, text))
         
         # Check if it's a valid 16-digit NIK
         if len(nik) == 16:
@@ -323,16 +432,7 @@ class IdentityDocumentExtractor:
         Returns:
             Text with converted numbers
         """
-        # Simple word to number mapping for Indonesian
-        word_to_number = {
-            'satu': '1', 'dua': '2', 'tiga': '3', 'empat': '4', 'lima': '5',
-            'enam': '6', 'tujuh': '7', 'delapan': '8', 'sembilan': '9', 'sepuluh': '10'
-        }
-        
-        for word, number in word_to_number.items():
-            text = text.replace(word, number)
-        
-        return text
+        return _RE_NUMBER_WORD.sub(_replace_number_word, text)
     
     def get_extraction_stats(self, text: str) -> Dict[str, Any]:
         """
@@ -350,6 +450,10 @@ class IdentityDocumentExtractor:
             "confidence": 0.0
         }
         
+        if self._is_too_short(text):
+            stats["extraction_method"] = "empty_input"
+            return stats
+        
         if self.spacy_service is not None:
             try:
                 spacy_stats = self.spacy_service.get_extraction_stats(text)
@@ -367,13 +471,19 @@ class IdentityDocumentExtractor:
         return stats
 
 
-# Global instance for reuse
-_extractor: Optional[IdentityDocumentExtractor] = None
+# Extractors are cached per model name; the lock keeps concurrent first
+# callers from loading the same spaCy model twice
+_extractor_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _create_extractor(model_name: str) -> IdentityDocumentExtractor:
+    return IdentityDocumentExtractor(model_name)
 
 
 def get_extractor(model_name: str = "id_core_news_sm") -> IdentityDocumentExtractor:
     """
-    Get or create a global extractor instance.
+    Get or create the shared extractor instance for a model.
     
     Args:
         model_name: Name of the spaCy model to use
@@ -381,34 +491,29 @@ def get_extractor(model_name: str = "id_core_news_sm") -> IdentityDocumentExtrac
     Returns:
         IdentityDocumentExtractor instance
     """
-    global _extractor
-    
-    if _extractor is None:
-        _extractor = IdentityDocumentExtractor(model_name)
-    
-    return _extractor
+    with _extractor_lock:
+        return _create_extractor(model_name)
 
 
 # Backward compatibility
+@dataclass(slots=True)
 class Result:
     """Backward compatibility class for the original extraction result."""
-    
-    def __init__(self):
-        self.nik: Optional[str] = None
-        self.nama: Optional[str] = None
-        self.tanggal_lahir: Optional[str] = None
-        self.tempat_lahir: Optional[str] = None
-        self.jenis_kelamin: Optional[str] = None
-        self.golongan_darah: Optional[str] = None
-        self.alamat: Optional[str] = None
-        self.rt: Optional[str] = None
-        self.rw: Optional[str] = None
-        self.kecamatan: Optional[str] = None
-        self.kelurahan_atau_desa: Optional[str] = None
-        self.kewarganegaraan: Optional[str] = None
-        self.pekerjaan: Optional[str] = None
-        self.agama: Optional[str] = None
-        self.status_perkawinan: Optional[str] = None
+    nik: Optional[str] = None
+    nama: Optional[str] = None
+    tanggal_lahir: Optional[str] = None
+    tempat_lahir: Optional[str] = None
+    jenis_kelamin: Optional[str] = None
+    golongan_darah: Optional[str] = None
+    alamat: Optional[str] = None
+    rt: Optional[str] = None
+    rw: Optional[str] = None
+    kecamatan: Optional[str] = None
+    kelurahan_atau_desa: Optional[str] = None
+    kewarganegaraan: Optional[str] = None
+    pekerjaan: Optional[str] = None
+    agama: Optional[str] = None
+    status_perkawinan: Optional[str] = None
 
 
 def extract_identity_info(text: str) -> Result:
@@ -424,24 +529,7 @@ def extract_identity_info(text: str) -> Result:
     extractor = get_extractor()
     extraction_result = extractor.extract(text)
     
-    # Convert to backward compatibility format
-    result = Result()
-    result.nik = extraction_result.nik
-    result.nama = extraction_result.nama
-    result.tanggal_lahir = extraction_result.tanggal_lahir
-    result.tempat_lahir = extraction_result.tempat_lahir
-    result.jenis_kelamin = extraction_result.jenis_kelamin
-    result.golongan_darah = extraction_result.golongan_darah
-    result.alamat = extraction_result.alamat
-    result.rt = extraction_result.rt
-    result.rw = extraction_result.rw
-    result.kecamatan = extraction_result.kecamatan
-    result.kelurahan_atau_desa = extraction_result.kelurahan_atau_desa
-    result.kewarganegaraan = extraction_result.kewarganegaraan
-    result.pekerjaan = extraction_result.pekerjaan
-    result.agama = extraction_result.agama
-    result.status_perkawinan = extraction_result.status_perkawinan
-    
-    return result
+    # Result carries the same fields minus confidence/extraction_method
+    return Result(**{name: getattr(extraction_result, name) for name in Result.__slots__})
 
 
@@ -3,10 +3,30 @@ S3 service for file uploads and management
 """
 import boto3
 import hashlib
+import io
 import os
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, BinaryIO
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from app.core.config import get_s3_config
+from app.utils.cache import BoundedCache
+
+# Part size and threshold for S3 multipart uploads (S3 requires parts of
+# at least 5 MiB)
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Managed transfer settings shared by every upload; parts of one multipart
+# upload are sent on up to max_concurrency pooled connections
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=STREAM_CHUNK_SIZE,
+    multipart_chunksize=STREAM_CHUNK_SIZE,
+    max_concurrency=16
+)
+
+# Maximum number of presigned GET URLs kept per service instance
+PRESIGNED_URL_CACHE_SIZE = 10000
 
 
 class S3Service:
@@ -16,6 +36,8 @@ class S3Service:
         self.config = get_s3_config()
         self.client = self._create_client()
         self.bucket_name = self.config.bucket_name
+        # (s3_key, expiration) -> (url, expires_at)
+        self._presigned_urls = BoundedCache(PRESIGNED_URL_CACHE_SIZE)
     
     def _create_client(self):
         """Create S3 client with configuration"""
@@ -29,10 +51,25 @@ class S3Service:
             's3',
             endpoint_url=self.config.endpoint_url,
             use_ssl=self.config.use_ssl,
-            verify=self.config.verify_ssl
+            verify=self.config.verify_ssl,
+            config=Config(
+                # Adaptive mode retries throttling/5xx with exponential backoff
+                # and rate-limits the client when S3 starts throttling
+                retries={'max_attempts': 5, 'mode': 'adaptive'},
+                # Room for concurrent batch uploads plus multipart part threads
+                max_pool_connections=64,
+                # Keep idle pooled connections open so requests skip the TLS handshake
+                tcp_keepalive=True
+            )
         )
     
-    def upload_file(self, file_content: bytes, file_name: str, content_type: str) -> Dict[str, Any]:
+    def upload_file(
+        self,
+        file_content: bytes,
+        file_name: str,
+        content_type: str,
+        file_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Upload file to S3
         
@@ -40,43 +77,40 @@ class S3Service:
             file_content: File content as bytes
             file_name: Name of the file
             content_type: MIME type of the file
+            file_hash: SHA-256 hex digest of the content, if already known
             
         Returns:
             Dict containing upload result with key, url, and metadata
         """
         try:
             # Generate file hash for unique naming
-            file_hash = hashlib.sha256(file_content).hexdigest()
+            if file_hash is None:
+                file_hash = hashlib.sha256(file_content).hexdigest()
             
             # Create S3 key with hash-based naming
             file_extension = os.path.splitext(file_name)[1]
             s3_key = f"uploads/{file_hash}{file_extension}"
             
-            # Upload to S3
-            self.client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                ContentType=content_type,
-                Metadata={
-                    'original_filename': file_name,
-                    'file_hash': file_hash,
-                    'content_type': content_type,
-                    'file_size': str(len(file_content))
-                }
+            # Upload to S3 (multipart with parallel parts for large files)
+            self.client.upload_fileobj(
+                io.BytesIO(file_content),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    'ContentType': content_type,
+                    'Metadata': {
+                        'original_filename': file_name,
+                        'file_hash': file_hash,
+                        'content_type': content_type,
+                        'file_size': str(len(file_content))
+                    }
+                },
+                Config=TRANSFER_CONFIG
             )
             
-            # Generate URL
-            if self.config.endpoint_url:
-                # For MinIO or other S3-compatible services
-                url = f"{self.config.endpoint_url}/{self.bucket_name}/{s3_key}"
-            else:
-                # For AWS S3
-                url = f"https://{self.bucket_name}.s3.{self.config.region_name}.amazonaws.com/{s3_key}"
-            
             return {
                 'key': s3_key,
-                'url': url,
+                'url': self.object_url(s3_key),
                 'hash': file_hash,
                 'size': len(file_content),
                 'original_filename': file_name,
@@ -90,6 +124,81 @@ class S3Service:
         except Exception as e:
             raise Exception(f"Upload failed: {str(e)}")
     
+    def upload_stream(
+        self,
+        fileobj: BinaryIO,
+        file_name: str,
+        content_type: str,
+        max_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload a seekable file object to S3 without loading it into memory
+        
+        The file is hashed in place to build the same hash-based key as
+        upload_file, rewound, and then sent with a managed (multipart for
+        large files) upload.
+        
+        Args:
+            fileobj: Seekable binary file, e.g. UploadFile.file
+            file_name: Name of the file
+            content_type: MIME type of the file
+            max_size: Optional size limit in bytes, checked before uploading
+            
+        Returns:
+            Dict containing upload result with key, url, and metadata
+            
+        Raises:
+            ValueError: If the file is larger than max_size
+        """
+        # file_digest reads into one reusable buffer and hashes in OpenSSL
+        fileobj.seek(0)
+        file_hash = hashlib.file_digest(fileobj, "sha256").hexdigest()
+        size = fileobj.seek(0, os.SEEK_END)
+        if max_size is not None and size > max_size:
+            raise ValueError("File too large")
+        fileobj.seek(0)
+        
+        file_extension = os.path.splitext(file_name)[1]
+        s3_key = f"uploads/{file_hash}{file_extension}"
+        
+        try:
+            self.client.upload_fileobj(
+                fileobj,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    'ContentType': content_type,
+                    'Metadata': {
+                        'original_filename': file_name,
+                        'file_hash': file_hash,
+                        'content_type': content_type,
+                        'file_size': str(size)
+                    }
+                },
+                Config=TRANSFER_CONFIG
+            )
+        except NoCredentialsError:
+            raise Exception("AWS credentials not found")
+        except ClientError as e:
+            raise Exception(f"S3 upload failed: {str(e)}")
+        
+        return {
+            'key': s3_key,
+            'url': self.object_url(s3_key),
+            'hash': file_hash,
+            'size': size,
+            'original_filename': file_name,
+            'content_type': content_type
+        }
+    
+    def object_url(self, s3_key: str) -> str:
+        """Build the public URL of an object"""
+        if self.config.endpoint_url:
+            # For MinIO or other S3-compatible services
+            return f"{self.config.endpoint_url}/{self.bucket_name}/{s3_key}"
+        # For AWS S3
+        return f"https://{self.bucket_name}.s3.{self.config.region_name}.amazonaws.com/{s3_key}"
+    
     def download_file(self, s3_key: str) -> bytes:
         """
         Download file from S3
@@ -163,6 +272,10 @@ class S3Service:
         """
         Generate presigned URL for file access
         
+        Signed URLs are cached and handed out again while they stay valid for
+        at least half of ``expiration``, so hot objects are not re-signed on
+        every request.
+        
         Args:
             s3_key: S3 object key
             expiration: URL expiration time in seconds
@@ -170,13 +283,58 @@ class S3Service:
         Returns:
             Presigned URL or None if failed
         """
+        cache_key = (s3_key, expiration)
+        now = time.time()
+        
+        cached = self._presigned_urls.get(cache_key)
+        if cached is not None and cached[1] - now >= expiration / 2:
+            return cached[0]
+        
         try:
             url = self.client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': s3_key},
                 ExpiresIn=expiration
             )
-            return url
+        except ClientError:
+            return None
+        
+        self._presigned_urls.set(cache_key, (url, now + expiration))
+        return url
+    
+    def generate_presigned_post(
+        self,
+        s3_key: str,
+        content_type: str,
+        max_size: int,
+        expiration: int = 3600
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate a presigned POST so a client can upload straight to S3
+        
+        S3 itself rejects uploads with a different content type or a body
+        larger than max_size.
+        
+        Args:
+            s3_key: S3 object key the client may write
+            content_type: Required MIME type of the upload
+            max_size: Maximum upload size in bytes
+            expiration: Form expiration time in seconds
+            
+        Returns:
+            Dict with the form ``url`` and ``fields`` or None if failed
+        """
+        try:
+            return self.client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Fields={'Content-Type': content_type},
+                Conditions=[
+                    {'Content-Type': content_type},
+                    ['content-length-range', 1, max_size]
+                ],
+                ExpiresIn=expiration
+            )
         except ClientError:
             return None
 
@@ -5,7 +5,9 @@ This service uses spaCy models to extract structured information from OCR text.
 
 import re
 import logging
-from typing import Dict,  Optional, Any, Tuple
+import functools
+import threading
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
 try:
@@ -17,10 +19,25 @@ except ImportError:
     Doc = None
     Language = None
 
+from app.core.config import get_config
+
 logger = logging.getLogger(__name__)
 
+# Pipeline components whose output the extraction never reads (it only uses doc.ents)
+UNUSED_PIPES = ("parser", "tagger", "attribute_ruler", "lemmatizer")
+
+
+def _load_time_disabled_pipes() -> List[str]:
+    """Components to disable when loading the model.
+
+    Any component listed in the comma-separated ``spacy_enabled_pipes``
+    setting is kept enabled, e.g. for tests that need the parser.
+    """
+    enabled = {name.strip() for name in get_config().spacy_enabled_pipes.split(",") if name.strip()}
+    return [name for name in UNUSED_PIPES if name not in enabled]
+
 
-@dataclass
+@dataclass(slots=True)
 class IdentityDocumentData:
     """Structured data extracted from identity documents."""
     nik: Optional[str] = None
@@ -46,7 +63,7 @@ class IdentityDocumentData:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, excluding None values."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {k: getattr(self, k) for k in self.__slots__ if getattr(self, k) is not None}
     
     def __str__(self) -> str:
         """String representation of extracted data."""
@@ -77,10 +94,17 @@ class SpacyExtractionService:
         self._setup_custom_patterns()
     
     def _load_model(self) -> None:
-        """Load the spaCy model."""
+        """Load the spaCy model, or a blank Indonesian pipeline for rule-only NER."""
+        # The KTP layout is regular enough for the entity ruler and regex fallbacks
+        if not get_config().use_statistical_ner:
+            self.nlp = spacy.blank("id")
+            logger.info("Using rule-based spaCy pipeline (set USE_STATISTICAL_NER=true to load a model)")
+            return
+        
         try:
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Loaded spaCy model: {self.model_name}")
+            disabled = _load_time_disabled_pipes()
+            self.nlp = spacy.load(self.model_name, disable=disabled)
+            logger.info(f"Loaded spaCy model: {self.model_name} (disabled: {', '.join(disabled) or 'none'})")
         except OSError as e:
             logger.error(f"Failed to load spaCy model {self.model_name}: {e}")
             logger.info("Please download the model using: poetry run python scripts/download_spacy_models.py")
@@ -153,7 +177,51 @@ class SpacyExtractionService:
         # Process with spaCy
         doc = self.nlp(cleaned_text)
         
-        # Extract structured data
+        result = self._build_result(doc, cleaned_text)
+        logger.info(f"Extracted data: {result}")
+        return result
+    
+    def extract_entities_batch(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> List[IdentityDocumentData]:
+        """
+        Extract structured data from several documents in one spaCy pass.
+        
+        The texts are streamed through ``nlp.pipe`` so tokenization and model
+        inference run in batches instead of once per document. Pipeline
+        components the extraction does not read are disabled.
+        
+        Args:
+            texts: OCR-processed texts, one per identity document
+            batch_size: Number of documents spaCy processes per batch;
+                defaults to the ``spacy_batch_size`` setting
+            
+        Returns:
+            IdentityDocumentData objects in the same order as ``texts``
+        """
+        if self.nlp is None:
+            raise RuntimeError("spaCy model not loaded")
+        
+        if batch_size is None:
+            batch_size = get_config().spacy_batch_size
+        
+        cleaned_texts = [self._preprocess_text(text) for text in texts]
+        disabled = [name for name in UNUSED_PIPES if name in self.nlp.pipe_names]
+        
+        results = []
+        for doc, cleaned_text in zip(
+            self.nlp.pipe(cleaned_texts, batch_size=batch_size, disable=disabled),
+            cleaned_texts
+        ):
+            results.append(self._build_result(doc, cleaned_text))
+        
+        logger.info(f"Extracted data for {len(results)} documents in batch")
+        return results
+    
+    def _build_result(self, doc: Doc, cleaned_text: str) -> IdentityDocumentData:
+        """Build the structured result from a processed spaCy document."""
         result = IdentityDocumentData()
         
         # Extract NIK
@@ -185,7 +253,6 @@ class SpacyExtractionService:
         result.issue_date, result.expiry_date = self._extract_dates(doc, cleaned_text)
         result.issuing_authority = self._extract_issuing_authority(doc, cleaned_text)
         
-        logger.info(f"Extracted data: {result}")
         return result
     
     def _preprocess_text(self, text: str) -> str:
@@ -195,7 +262,6 @@ class SpacyExtractionService:
         
         # Normalize common OCR errors
         text = text.replace('|', 'I')  # Common OCR error
-        text = text.replace('0', 'O')  # Common OCR error in certain contexts
         
         # Add line breaks for better sentence segmentation
         text = re.sub(r'([A-Z][a-z]+:)', r'\n\1', text)
@@ -540,7 +606,8 @@ class SpacyExtractionService:
             "tokens_count": len(doc),
             "entities_count": len(doc.ents),
             "entity_types": {},
-            "sentences_count": len(list(doc.sents)),
+            # Sentence boundaries come from the parser, which may be disabled
+            "sentences_count": len(list(doc.sents)) if doc.has_annotation("SENT_START") else 0,
         }
         
         # Count entity types
@@ -551,13 +618,22 @@ class SpacyExtractionService:
         return stats
 
 
-# Global instance for reuse
-_spacy_extraction_service: Optional[SpacyExtractionService] = None
+# Services are cached per model name; the lock keeps concurrent first
+# callers from loading the same spaCy model twice
+_spacy_service_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _create_spacy_extraction_service(model_name: str) -> SpacyExtractionService:
+    return SpacyExtractionService(model_name)
 
 
 def get_spacy_extraction_service(model_name: str = "id_core_news_sm") -> SpacyExtractionService:
     """
-    Get or create a global spaCy extraction service instance.
+    Get or create the shared spaCy extraction service for a model.
+    
+    The service is built at most once per model name and process, even when
+    several threads ask for it while the model is still loading.
     
     Args:
         model_name: Name of the spaCy model to use
@@ -565,9 +641,5 @@ def get_spacy_extraction_service(model_name: str = "id_core_news_sm") -> SpacyEx
     Returns:
         SpacyExtractionService instance
     """
-    global _spacy_extraction_service
-    
-    if _spacy_extraction_service is None:
-        _spacy_extraction_service = SpacyExtractionService(model_name)
-    
-    return _spacy_extraction_service 
\ No newline at end of file
+    with _spacy_service_lock:
+        return _create_spacy_extraction_service(model_name)
@@ -196,7 +196,7 @@ def generate_media_thumbnails(media_id: str):
         
         try:
             # Get media record
-            media = db.query(Media).filter(Media.id == media_id).first()
+            media = db.get(Media, media_id)
             if not media:
                 raise Exception(f"Media record not found: {media_id}")
             
@@ -1,16 +1,138 @@
 """
 Celery tasks for OCR processing
 """
-import os
-import tempfile
 import time
-from typing import Dict, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional
+from celery.signals import worker_process_init
+from sqlalchemy import insert, update
 from app.core.celery_app import celery_app
 from app.services.s3_service import s3_service
 from app.core.database_session import get_db
 from app.models.media import Media
 from app.models.ocr_job import OCRJob
-from app.services.extract_text_identity import read_image
+from app.utils.ocr import init_tesseract_api, read_image_bytes
+
+
+@worker_process_init.connect
+def init_ocr_worker(**kwargs):
+    """Load the Tesseract API once per worker process"""
+    init_tesseract_api()
+
+
+# Number of images handled by one process_ocr_batch task
+OCR_BATCH_SIZE = 16
+
+# Maximum S3 downloads in flight or waiting for OCR while a batch is
+# processed; bounds both concurrent GETs and image bytes held in memory
+OCR_DOWNLOAD_CONCURRENCY = 8
+
+# Upper bound on PROGRESS state writes to the result backend per task
+MAX_PROGRESS_UPDATES = 20
+
+
+def _should_report_progress(index: int, total: int) -> bool:
+    """Return True for at most MAX_PROGRESS_UPDATES evenly spaced loop indexes"""
+    # Ceiling division leaves one of the updates for the final index
+    step = max(1, -(-total // (MAX_PROGRESS_UPDATES - 1)))
+    return index % step == 0 or index == total - 1
+
+
+def _run_ocr(
+    db,
+    media: Media,
+    user_id: Optional[str] = None,
+    on_progress: Optional[Callable[[str, int], None]] = None,
+    fetch_content: Optional[Callable[[], bytes]] = None
+) -> Dict[str, Any]:
+    """
+    Run OCR on a media file and record the outcome in a new OCR job
+    
+    Args:
+        db: Database session
+        media: Media record to process
+        user_id: Optional user ID for tracking
+        on_progress: Optional callback receiving a status message and percentage
+        fetch_content: Optional callable returning the file bytes, e.g. a
+            prefetched download; defaults to downloading from S3
+        
+    Returns:
+        Dict containing OCR results and job status
+    """
+    # Create OCR job record; the job is only ever updated by id below, so
+    # insert it through Core instead of tracking an ORM instance
+    started_at = time.time()
+    ocr_job_id = db.execute(
+        insert(OCRJob).values(
+            user_id=user_id,
+            document_id=None,  # Will be set later if needed
+            job_status="processing",
+            input_file_path=media.file_name,
+            created_at=int(started_at),
+            updated_at=int(started_at)
+        ).returning(OCRJob.id)
+    ).scalar_one()
+    db.commit()
+    
+    try:
+        if on_progress:
+            on_progress("Processing OCR", 30)
+        
+        # Download file from S3
+        if fetch_content:
+            file_content = fetch_content()
+        else:
+            file_content = s3_service.download_file(media.file_name)
+        
+        # Process OCR straight from the downloaded bytes
+        ocr = read_image_bytes(file_content)
+        del file_content
+        extracted_text = ocr.output()
+        
+        if on_progress:
+            on_progress("Saving results", 80)
+        
+        # Update OCR job with results
+        finished_at = time.time()
+        output_data = {
+            "extracted_text": extracted_text,
+            "confidence": getattr(ocr, 'confidence', None),
+            "processing_time_ms": int((finished_at - started_at) * 1000)
+        }
+        db.execute(
+            update(OCRJob).where(OCRJob.id == ocr_job_id).values(
+                job_status="completed",
+                output_data=output_data,
+                processing_time_ms=output_data["processing_time_ms"],
+                updated_at=int(finished_at)
+            )
+        )
+        db.commit()
+        
+        return {
+            "status": "success",
+            "media_id": str(media.id),
+            "ocr_job_id": str(ocr_job_id),
+            "extracted_text": extracted_text,
+            "processing_time_ms": output_data["processing_time_ms"]
+        }
+        
+    except Exception as e:
+        # Update OCR job with error
+        db.rollback()
+        try:
+            db.execute(
+                update(OCRJob).where(OCRJob.id == ocr_job_id).values(
+                    job_status="failed",
+                    error_message=str(e),
+                    updated_at=int(time.time())
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+        raise
 
 
 @celery_app.task(bind=True)
@@ -25,104 +147,119 @@ def process_ocr_image(self, media_id: str, user_id: Optional[str] = None) -> Dic
     Returns:
         Dict containing OCR results and job status
     """
-    try:
-        # Update task status
+    def report_progress(status: str, progress: int):
         self.update_state(
             state="PROGRESS",
-            meta={"status": "Downloading file from S3", "progress": 10}
+            meta={"status": status, "progress": progress}
         )
+    
+    try:
+        # Update task status
+        report_progress("Downloading file from S3", 10)
         
         # Get database session
         db = next(get_db())
         
         try:
             # Get media record
-            media = db.query(Media).filter(Media.id == media_id).first()
+            media = db.get(Media, media_id)
             if not media:
                 raise Exception(f"Media record not found: {media_id}")
             
-            # Create OCR job record
-            ocr_job = OCRJob(
-                user_id=user_id,
-                document_id=None,  # Will be set later if needed
-                job_status="processing",
-                input_file_path=media.file_name,
-                created_at=int(time.time()),
-                updated_at=int(time.time())
-            )
-            db.add(ocr_job)
-            db.commit()
-            db.refresh(ocr_job)
-            
-            # Update task status
-            self.update_state(
-                state="PROGRESS",
-                meta={"status": "Processing OCR", "progress": 30}
-            )
-            
-            # Download file from S3
-            file_content = s3_service.download_file(media.file_name)
+            return _run_ocr(db, media, user_id, on_progress=report_progress)
             
-            # Create temporary file for OCR processing
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(media.file_name)[1]) as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
+        finally:
+            db.close()
             
-            try:
-                # Process OCR
-                ocr = read_image(temp_file_path)
-                extracted_text = ocr.output()
-                
-                # Update task status
+    except Exception as e:
+        raise Exception(f"OCR processing failed: {str(e)}")
+
+
+@celery_app.task(bind=True)
+def process_ocr_batch(self, media_ids: list, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Process OCR on a batch of images within a single task
+    
+    The images are handled sequentially in this worker process so the
+    broker round-trip and Tesseract initialisation are paid once per batch
+    rather than once per image.
+    
+    Args:
+        media_ids: List of media IDs to process
+        user_id: Optional user ID for tracking
+        
+    Returns:
+        Dict containing per-image results
+    """
+    results = []
+    total = len(media_ids)
+    
+    db = next(get_db())
+    executor = ThreadPoolExecutor(max_workers=OCR_DOWNLOAD_CONCURRENCY)
+    
+    try:
+        # Load every media record of the batch in one query
+        media_records = db.query(Media).filter(Media.id.in_(media_ids)).all()
+        media_by_id = {str(media.id): media for media in media_records}
+        
+        # Downloads overlap with OCR of earlier images but run as a sliding
+        # window: OCR_DOWNLOAD_CONCURRENCY are started up front and the next
+        # one only when a result is taken, so finished downloads cannot pile
+        # up in memory. They are queued and consumed in batch order.
+        to_download = iter([
+            media_by_id[str(media_id)] for media_id in media_ids if str(media_id) in media_by_id
+        ])
+        downloads = deque()
+        
+        def prefetch_next() -> None:
+            next_media = next(to_download, None)
+            if next_media is not None:
+                downloads.append(executor.submit(s3_service.download_file, next_media.file_name))
+        
+        for _ in range(OCR_DOWNLOAD_CONCURRENCY):
+            prefetch_next()
+        
+        for i, media_id in enumerate(media_ids):
+            if _should_report_progress(i, total):
                 self.update_state(
                     state="PROGRESS",
-                    meta={"status": "Saving results", "progress": 80}
+                    meta={
+                        "status": f"Processing {i+1}/{total}",
+                        "progress": int((i / total) * 100),
+                        "current": media_id
+                    }
                 )
-                
-                # Update OCR job with results
-                ocr_job.job_status = "completed"
-                ocr_job.output_data = {
-                    "extracted_text": extracted_text,
-                    "confidence": getattr(ocr, 'confidence', None),
-                    "processing_time_ms": int((time.time() - ocr_job.created_at) * 1000)
-                }
-                ocr_job.updated_at = int(time.time())
-                
-                # Update media record with OCR results
-                media.custom_attribute = f"ocr_processed_{ocr_job.id}"
-                
-                db.commit()
-                
-                return {
-                    "status": "success",
+            
+            media = media_by_id.get(str(media_id))
+            if not media:
+                results.append({
                     "media_id": media_id,
-                    "ocr_job_id": str(ocr_job.id),
-                    "extracted_text": extracted_text,
-                    "processing_time_ms": ocr_job.output_data["processing_time_ms"]
-                }
-                
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                    
-        finally:
-            db.close()
+                    "error": f"Media record not found: {media_id}",
+                    "status": "failed"
+                })
+                continue
             
-    except Exception as e:
-        # Update OCR job with error
-        try:
-            db = next(get_db())
-            ocr_job = db.query(OCRJob).filter(OCRJob.id == ocr_job.id).first()
-            if ocr_job:
-                ocr_job.job_status = "failed"
-                ocr_job.error_message = str(e)
-                ocr_job.updated_at = int(time.time())
-                db.commit()
-        except:
-            pass
-        
-        raise Exception(f"OCR processing failed: {str(e)}")
+            # The oldest queued download belongs to this media
+            download = downloads.popleft()
+            prefetch_next()
+            try:
+                results.append(_run_ocr(db, media, user_id, fetch_content=download.result))
+            except Exception as e:
+                results.append({
+                    "media_id": media_id,
+                    "error": str(e),
+                    "status": "failed"
+                })
+                
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        db.close()
+    
+    return {
+        "status": "completed",
+        "total_processed": len(results),
+        "results": results
+    }
 
 
 @celery_app.task(bind=True)
@@ -130,6 +267,9 @@ def process_bulk_ocr(self, media_ids: list, user_id: Optional[str] = None) -> Di
     """
     Process OCR on multiple images
     
+    The media IDs are split into batches of OCR_BATCH_SIZE, each handled
+    by one process_ocr_batch task.
+    
     Args:
         media_ids: List of media IDs to process
         user_id: Optional user ID for tracking
@@ -139,34 +279,38 @@ def process_bulk_ocr(self, media_ids: list, user_id: Optional[str] = None) -> Di
     """
     results = []
     total = len(media_ids)
+    batch_starts = range(0, total, OCR_BATCH_SIZE)
     
-    for i, media_id in enumerate(media_ids):
+    for i, start in enumerate(batch_starts):
+        batch = media_ids[start:start + OCR_BATCH_SIZE]
+        
         try:
             # Update progress
-            progress = int((i / total) * 100)
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "status": f"Processing {i+1}/{total}",
-                    "progress": progress,
-                    "current": media_id
-                }
-            )
+            if _should_report_progress(i, len(batch_starts)):
+                progress = int((start / total) * 100)
+                self.update_state(
+                    state="PROGRESS",
+                    meta={
+                        "status": f"Queueing {start + len(batch)}/{total}",
+                        "progress": progress,
+                        "current": batch[0]
+                    }
+                )
             
-            # Process individual OCR
-            result = process_ocr_image.delay(media_id, user_id)
-            results.append({
+            # Process the batch in a single worker task
+            result = process_ocr_batch.delay(batch, user_id)
+            results.extend({
                 "media_id": media_id,
                 "task_id": result.id,
                 "status": "queued"
-            })
+            } for media_id in batch)
             
         except Exception as e:
-            results.append({
+            results.extend({
                 "media_id": media_id,
                 "error": str(e),
                 "status": "failed"
-            })
+            } for media_id in batch)
     
     return {
         "status": "completed",
@@ -175,9 +319,14 @@ def process_bulk_ocr(self, media_ids: list, user_id: Optional[str] = None) -> Di
     }
 
 
+# Rows removed per transaction by cleanup_failed_ocr_jobs
+CLEANUP_BATCH_SIZE = 10000
+
+
 @celery_app.task
 def cleanup_failed_ocr_jobs():
     """Clean up failed OCR jobs older than 24 hours"""
+    db = None
     try:
         import time
         from app.core.database_session import get_db
@@ -185,14 +334,25 @@ def cleanup_failed_ocr_jobs():
         
         db = next(get_db())
         
-        # Delete failed jobs older than 24 hours
+        # Delete failed jobs older than 24 hours in bounded batches so each
+        # transaction holds its locks only briefly. Query.delete() cannot be
+        # combined with LIMIT, so each batch is selected by id first.
         cutoff_time = int(time.time()) - (24 * 60 * 60)
-        deleted_count = db.query(OCRJob).filter(
-            OCRJob.job_status == "failed",
-            OCRJob.created_at < cutoff_time
-        ).delete()
-        
-        db.commit()
+        deleted_count = 0
+        while True:
+            batch_ids = db.query(OCRJob.id).filter(
+                OCRJob.job_status == "failed",
+                OCRJob.created_at < cutoff_time
+            ).limit(CLEANUP_BATCH_SIZE).subquery()
+            
+            deleted = db.query(OCRJob).filter(
+                OCRJob.id.in_(db.query(batch_ids.c.id))
+            ).delete(synchronize_session=False)
+            db.commit()
+            
+            deleted_count += deleted
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
         
         return {
             "status": "success",
@@ -205,4 +365,5 @@ def cleanup_failed_ocr_jobs():
             "error": str(e)
         }
     finally:
-        db.close() 
\ No newline at end of file
+        if db is not None:
+            db.close()
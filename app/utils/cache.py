@@ -0,0 +1,50 @@
+"""
+Bounded in-process cache shared by the API, S3 service and OCR helpers.
+"""
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+
+class BoundedCache:
+    """
+    Thread-safe mapping capped at ``maxsize`` entries.
+
+    When full, the oldest entry is evicted (dicts keep insertion order).
+    With ``lru=True`` a hit moves the entry to the end, so the least
+    recently used entry is evicted instead. Expiry, where needed, is up to
+    the caller, e.g. by storing ``(value, expires_at)`` pairs.
+    """
+
+    def __init__(self, maxsize: int, lru: bool = False):
+        self.maxsize = maxsize
+        self.lru = lru
+        self._data: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the value cached for key, or default"""
+        with self._lock:
+            if not self.lru:
+                return self._data.get(key, default)
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value as the newest entry, evicting the oldest one if full"""
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = value
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,5 +1,5 @@
-from typing import List, Optional, Type, Union
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple, Type, Union
+from sqlalchemy.orm import Session, selectinload
 from app.models.media import Media
 from app.models.mediable import Mediable
 from app.models.user import User
@@ -20,13 +20,37 @@ class MediaManager:
         mediable = Mediable(
             media_id=media.id,
             mediable_id=model.id,
-            mediable_type=model.__class__.__name__,
+            mediable_type=model.POLY_TYPE,
             group=group
         )
         db.add(mediable)
         db.commit()
         return mediable
     
+    @staticmethod
+    def bulk_attach(
+        db: Session,
+        model: Union[User, IdentityDocument],
+        media_list: List[Media],
+        group: str = "default"
+    ) -> int:
+        """Attach several media to a model with one bulk INSERT and a single commit"""
+        rows = [
+            {
+                "media_id": media.id,
+                "mediable_id": model.id,
+                "mediable_type": model.POLY_TYPE,
+                "group": group
+            }
+            for media in media_list
+        ]
+        if not rows:
+            return 0
+        
+        db.bulk_insert_mappings(Mediable, rows)
+        db.commit()
+        return len(rows)
+    
     @staticmethod
     def detach_media_from_model(
         db: Session,
@@ -38,7 +62,7 @@ class MediaManager:
         query = db.query(Mediable).filter(
             Mediable.media_id == media.id,
             Mediable.mediable_id == model.id,
-            Mediable.mediable_type == model.__class__.__name__
+            Mediable.mediable_type == model.POLY_TYPE
         )
         
         if group:
@@ -55,17 +79,27 @@ class MediaManager:
     def get_model_media(
         db: Session,
         model: Union[User, IdentityDocument],
-        group: Optional[str] = None
+        group: Optional[str] = None,
+        eager: bool = False
     ) -> List[Media]:
-        """Get all media associated with a model"""
+        """
+        Get all media associated with a model
+
+        With ``eager=True`` the ``Media.mediables`` collection of every result
+        is populated by one extra SELECT ... IN query, so iterating the
+        relationships afterwards does not issue a query per media row.
+        """
         query = db.query(Media).join(Mediable).filter(
             Mediable.mediable_id == model.id,
-            Mediable.mediable_type == model.__class__.__name__
+            Mediable.mediable_type == model.POLY_TYPE
         )
         
         if group:
             query = query.filter(Mediable.group == group)
         
+        if eager:
+            query = query.options(selectinload(Media.mediables))
+        
         return query.all()
     
     @staticmethod
@@ -94,6 +128,22 @@ class MediaManager:
         """Get all relationships for a media item"""
         return db.query(Mediable).filter(Mediable.media_id == media.id).all()
     
+    @staticmethod
+    def get_media_by_hash(db: Session, file_hash: str) -> Optional[Media]:
+        """Get a live (not soft-deleted) media record by content hash"""
+        return db.query(Media).filter(
+            Media.hash == file_hash,
+            Media.deleted_at.is_(None)
+        ).first()
+    
+    @staticmethod
+    def get_media_by_file_name(db: Session, file_name: str) -> Optional[Media]:
+        """Get a live (not soft-deleted) media record by its S3 key"""
+        return db.query(Media).filter(
+            Media.file_name == file_name,
+            Media.deleted_at.is_(None)
+        ).first()
+    
     @staticmethod
     def create_media(
         db: Session,
@@ -110,6 +160,7 @@ class MediaManager:
         """Create a new media record"""
         import time
         
+        now = time.time()
         media = Media(
             name=name,
             file_name=file_name,
@@ -120,15 +171,63 @@ class MediaManager:
             hash=hash,
             custom_attribute=custom_attribute,
             parent_id=parent_id,
-            created_at=time.time(),
-            updated_at=time.time()
+            created_at=now,
+            updated_at=now
         )
         
         db.add(media)
         db.commit()
         db.refresh(media)
         return media
-    
+
+    @staticmethod
+    def create_and_attach(
+        db: Session,
+        model: Union[User, IdentityDocument],
+        name: str,
+        file_name: str,
+        disk: str,
+        mime_type: str,
+        size: int,
+        created_by: Optional[str] = None,
+        hash: Optional[str] = None,
+        custom_attribute: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        group: str = "default"
+    ) -> Tuple[Media, Mediable]:
+        """Create a media record and attach it to a model in a single transaction"""
+        import time
+
+        now = time.time()
+        media = Media(
+            name=name,
+            file_name=file_name,
+            disk=disk,
+            mime_type=mime_type,
+            size=size,
+            created_by=created_by,
+            hash=hash,
+            custom_attribute=custom_attribute,
+            parent_id=parent_id,
+            created_at=now,
+            updated_at=now
+        )
+        db.add(media)
+
+        # Flush (not commit) so the generated media id is available for the link row
+        db.flush()
+
+        mediable = Mediable(
+            media_id=media.id,
+            mediable_id=model.id,
+            mediable_type=model.POLY_TYPE,
+            group=group
+        )
+        db.add(mediable)
+        db.commit()
+        db.refresh(media)
+        return media, mediable
+
     @staticmethod
     def delete_media(
         db: Session,
@@ -143,27 +242,33 @@ class MediaManager:
         db.commit()
         return True
     
-    @staticmethod
-    def get_media_by_group(
-        db: Session,
-        model: Union[User, IdentityDocument],
-        group: str
-    ) -> List[Media]:
-        """Get media for a model by group"""
-        return MediaManager.get_model_media(db, model, group)
-    
     @staticmethod
     def get_media_by_type(
         db: Session,
         model: Union[User, IdentityDocument],
-        mime_type: str
+        mime_type: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None
     ) -> List[Media]:
-        """Get media for a model by MIME type"""
-        return db.query(Media).join(Mediable).filter(
+        """
+        Get media for a model by MIME type
+
+        Pass ``limit`` (and the last seen ``after_id``) to page through large
+        result sets by media id instead of loading every match at once.
+        """
+        query = db.query(Media).join(Mediable).filter(
             Mediable.mediable_id == model.id,
-            Mediable.mediable_type == model.__class__.__name__,
+            Mediable.mediable_type == model.POLY_TYPE,
             Media.mime_type == mime_type
-        ).all()
+        )
+        
+        if after_id is not None:
+            query = query.filter(Media.id > after_id)
+        
+        if limit is not None:
+            query = query.order_by(Media.id).limit(limit)
+        
+        return query.all()
 
 
 # Convenience functions
@@ -0,0 +1,248 @@
+"""
+OCR helpers for reading text from identity document images.
+
+When the ``tesserocr`` bindings are installed a small pool of in-process
+Tesseract APIs is kept warm per worker process, avoiding the fork/exec and
+language model load that ``pytesseract`` pays on every call. Otherwise the
+``pytesseract`` command line wrapper is used. Images are binarized with
+OpenCV before recognition unless the ``ocr_preprocess`` setting is off.
+"""
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# One OpenMP thread per Tesseract call is faster for single images and
+# lets the worker processes, not Tesseract, provide the parallelism.
+# Must be set before the Tesseract library is loaded.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+import cv2
+import numpy as np
+from PIL import Image
+
+try:
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+from app.core.config import get_config
+from app.utils.cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+# Tesseract languages installed in the Docker image
+DEFAULT_LANG = "eng"
+
+# LSTM engine only, page treated as a single uniform block of text
+TESSERACT_CONFIG = "--oem 1 --psm 6"
+
+# Images whose longest side exceeds this are scaled down before OCR
+MAX_OCR_DIMENSION = 1600
+
+# Number of OCR results kept per process, keyed by a hash of the image
+# content, so retried and resubmitted images skip recognition
+OCR_RESULT_CACHE_SIZE = 512
+
+# lang -> idle APIs loaded with that language, and how many exist in total
+_apis: Dict[str, "queue.LifoQueue"] = {}
+_api_counts: Dict[str, int] = {}
+_api_lock = threading.Lock()
+
+# (content digest, lang) -> OCRResult
+_results = BoundedCache(OCR_RESULT_CACHE_SIZE, lru=True)
+
+
+class OCRResult:
+    """Text and mean confidence produced by an OCR run"""
+
+    def __init__(self, text: str, confidence: Optional[float] = None):
+        self.text = text
+        self.confidence = confidence
+
+    def output(self) -> str:
+        """Return the extracted text"""
+        return self.text
+
+
+def _create_api(lang: str):
+    """Create a Tesseract API for a language; called with _api_lock held"""
+    api = PyTessBaseAPI(lang=lang, psm=PSM.SINGLE_BLOCK, oem=OEM.LSTM_ONLY)
+    _api_counts[lang] = _api_counts.get(lang, 0) + 1
+    logger.info(f"Initialized in-process Tesseract API {_api_counts[lang]}/{get_config().tesseract_pool_size} (lang={lang})")
+    return api
+
+
+def init_tesseract_api(lang: str = DEFAULT_LANG):
+    """
+    Create the first pooled Tesseract API for a language if tesserocr is available.
+
+    Celery workers call this from ``worker_process_init`` so the language
+    data is loaded once per child process instead of once per image.
+
+    Args:
+        lang: Tesseract language string, e.g. ``"eng"`` or ``"ind+eng"``
+
+    Returns:
+        True once an API exists, or None when tesserocr is not installed
+    """
+    if PyTessBaseAPI is None:
+        return None
+
+    with _api_lock:
+        if not _api_counts.get(lang):
+            _apis.setdefault(lang, queue.LifoQueue()).put(_create_api(lang))
+
+    return True
+
+
+@contextmanager
+def _borrow_api(lang: str) -> Iterator[Any]:
+    """
+    Take a Tesseract API for ``lang`` from the pool for the duration of one image.
+
+    Each language has its own pool, since an API only recognises the
+    languages it was initialised with. A new instance is created while the
+    language's pool is below the ``tesseract_pool_size`` setting; after
+    that callers wait for an instance to be returned.
+    """
+    with _api_lock:
+        pool = _apis.setdefault(lang, queue.LifoQueue())
+
+    try:
+        api = pool.get_nowait()
+    except queue.Empty:
+        with _api_lock:
+            api = _create_api(lang) if _api_counts.get(lang, 0) < get_config().tesseract_pool_size else None
+        if api is None:
+            api = pool.get()
+
+    try:
+        yield api
+    finally:
+        pool.put(api)
+
+
+def _digest_bytes(data: bytes) -> bytes:
+    """16-byte cache key for image content; BLAKE3 (SIMD) when installed, else blake2b"""
+    if blake3 is not None:
+        return blake3.blake3(data).digest(length=16)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def decode_grayscale(image: Image.Image) -> Image.Image:
+    """
+    Decode an opened image as 8-bit grayscale no larger than MAX_OCR_DIMENSION.
+
+    For JPEGs ``draft`` lets libjpeg skip chroma and scale by 1/2, 1/4 or
+    1/8 in the DCT domain, so oversized scans are never decoded at full
+    resolution; the remainder is a cheap resize of the reduced image.
+    """
+    width, height = image.size
+    longest = max(width, height)
+    if image.format == "JPEG":
+        ratio = min(1.0, MAX_OCR_DIMENSION / longest)
+        image.draft("L", (max(1, int(width * ratio)), max(1, int(height * ratio))))
+
+    gray = image.convert("L")
+    if max(gray.size) > MAX_OCR_DIMENSION:
+        gray.thumbnail((MAX_OCR_DIMENSION, MAX_OCR_DIMENSION), Image.Resampling.BILINEAR)
+    return gray
+
+
+def preprocess_image(gray: np.ndarray) -> np.ndarray:
+    """
+    Prepare a grayscale image for OCR.
+
+    Oversized scans are shrunk to MAX_OCR_DIMENSION on the longest side and
+    the result is binarized with a Gaussian adaptive threshold, which copes
+    with the uneven lighting of photographed ID cards.
+
+    Args:
+        gray: 8-bit single channel image
+
+    Returns:
+        8-bit binary (0/255) image
+    """
+    height, width = gray.shape
+    longest = max(height, width)
+    if longest > MAX_OCR_DIMENSION:
+        scale = MAX_OCR_DIMENSION / longest
+        gray = cv2.resize(gray, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
+
+
+def _ocr_pixels(pixels: np.ndarray, lang: str = DEFAULT_LANG) -> OCRResult:
+    """Run OCR on an 8-bit single channel image"""
+    if init_tesseract_api(lang) is not None:
+        height, width = pixels.shape
+        with _borrow_api(lang) as api:
+            api.SetImageBytes(pixels.tobytes(), width, height, 1, width)
+            return OCRResult(api.GetUTF8Text(), api.MeanTextConf())
+
+    if pytesseract is None:
+        raise ImportError("No OCR backend installed. Please install it with: poetry install")
+
+    text = pytesseract.image_to_string(pixels, lang=lang, config=TESSERACT_CONFIG)
+    return OCRResult(text)
+
+
+def _ocr_image(image: Image.Image, lang: str = DEFAULT_LANG) -> OCRResult:
+    """Run OCR on a decoded PIL image"""
+    if init_tesseract_api(lang) is not None:
+        with _borrow_api(lang) as api:
+            api.SetImage(image)
+            return OCRResult(api.GetUTF8Text(), api.MeanTextConf())
+
+    if pytesseract is None:
+        raise ImportError("No OCR backend installed. Please install it with: poetry install")
+
+    text = pytesseract.image_to_string(image, lang=lang, config=TESSERACT_CONFIG)
+    return OCRResult(text)
+
+
+def read_image_bytes(data: bytes, lang: str = DEFAULT_LANG) -> OCRResult:
+    """
+    Run OCR on an encoded image held in memory.
+
+    Used by the OCR tasks so downloaded files never touch disk: there is no
+    temporary file to create, write and unlink per image. Results are
+    cached by content hash, so a retried task re-uses the earlier output.
+
+    Args:
+        data: Encoded image bytes, e.g. a JPEG downloaded from S3
+        lang: Tesseract language string
+
+    Returns:
+        OCRResult with the extracted text
+    """
+    key = (_digest_bytes(data), lang)
+    result = _results.get(key)
+    if result is not None:
+        return result
+
+    with Image.open(io.BytesIO(data)) as image:
+        gray = decode_grayscale(image)
+
+    if get_config().ocr_preprocess:
+        result = _ocr_pixels(preprocess_image(np.asarray(gray)), lang)
+    else:
+        result = _ocr_image(gray, lang)
+
+    _results.set(key, result)
+    return result
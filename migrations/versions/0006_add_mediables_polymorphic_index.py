@@ -0,0 +1,25 @@
+"""add_mediables_polymorphic_index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Composite index covering the polymorphic lookups (type, id[, group]).
+    # It supersedes ix_mediables_type_id, which is a prefix of it.
+    op.create_index('ix_mediables_type_id_group', 'mediables', ['mediable_type', 'mediable_id', 'group'], unique=False)
+    op.drop_index(op.f('ix_mediables_type_id'), table_name='mediables')
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_mediables_type_id'), 'mediables', ['mediable_type', 'mediable_id'], unique=False)
+    op.drop_index('ix_mediables_type_id_group', table_name='mediables')
@@ -0,0 +1,23 @@
+"""compress_ocr_output_data
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Store large OCR payloads with lz4 TOAST compression (PostgreSQL 14+).
+    # Only values written after this point are recompressed.
+    op.execute("ALTER TABLE ocr_jobs ALTER COLUMN output_data SET COMPRESSION lz4")
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE ocr_jobs ALTER COLUMN output_data SET COMPRESSION pglz")
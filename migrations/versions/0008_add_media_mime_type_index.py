@@ -0,0 +1,21 @@
+"""add_media_mime_type_index
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_media_mime_type'), 'media', ['mime_type'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_media_mime_type'), table_name='media')
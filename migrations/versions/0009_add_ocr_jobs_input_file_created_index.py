@@ -0,0 +1,29 @@
+"""add_ocr_jobs_input_file_created_index
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Serves the per-media OCR results listing (filter on input_file_path,
+    # newest first) as one ordered range scan with no sort step.
+    # ix_ocr_jobs_created_at stays: failed-job cleanup filters on created_at alone.
+    op.create_index(
+        'ix_ocr_jobs_input_file_created',
+        'ocr_jobs',
+        ['input_file_path', sa.text('created_at DESC')],
+        unique=False
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_ocr_jobs_input_file_created', table_name='ocr_jobs')
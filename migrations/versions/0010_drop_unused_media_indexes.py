@@ -0,0 +1,41 @@
+"""drop_unused_media_indexes
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Nothing filters media by name or the audit user columns, so these
+    # indexes only add write cost to every insert/update.
+    # ix_media_hash, ix_media_file_name (lookups by S3 key) and
+    # ix_media_parent_id (children lookups) stay.
+    op.drop_index(op.f('ix_media_name'), table_name='media')
+    op.drop_index(op.f('ix_media_updated_by'), table_name='media')
+    op.drop_index(op.f('ix_media_deleted_by'), table_name='media')
+
+    # Per-user listings only ever look at live media
+    op.create_index(
+        'ix_media_live_created_by',
+        'media',
+        ['created_by'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+    op.drop_index(op.f('ix_media_created_by'), table_name='media')
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_media_created_by'), 'media', ['created_by'], unique=False)
+    op.drop_index('ix_media_live_created_by', table_name='media')
+    op.create_index(op.f('ix_media_deleted_by'), 'media', ['deleted_by'], unique=False)
+    op.create_index(op.f('ix_media_updated_by'), 'media', ['updated_by'], unique=False)
+    op.create_index(op.f('ix_media_name'), 'media', ['name'], unique=False)
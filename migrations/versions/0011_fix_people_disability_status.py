@@ -0,0 +1,48 @@
+"""fix_people_disability_status
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # "> 0" rejected the column's own default of 0, so every insert that
+    # relied on the default failed
+    op.drop_constraint('check_disability_status_positive', 'people', type_='check')
+    op.alter_column(
+        'people',
+        'disability_status',
+        existing_type=sa.Integer(),
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        existing_server_default='0'
+    )
+    op.create_check_constraint('check_disability_status_nonneg', 'people', 'disability_status >= 0')
+
+def downgrade() -> None:
+    op.drop_constraint('check_disability_status_nonneg', 'people', type_='check')
+    op.alter_column(
+        'people',
+        'disability_status',
+        existing_type=sa.SmallInteger(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+        existing_server_default='0'
+    )
+    # Rows written since the upgrade may hold the default 0, so the old
+    # constraint only applies to new rows (NOT VALID skips the table scan)
+    op.create_check_constraint(
+        'check_disability_status_positive',
+        'people',
+        'disability_status > 0',
+        postgresql_not_valid=True
+    )
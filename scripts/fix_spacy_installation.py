@@ -7,28 +7,44 @@ This script resolves common spaCy installation problems.
 import subprocess
 import sys
 import os
+from collections import deque
 from pathlib import Path
 
 
+# Lines of stderr kept to report why a command failed
+STDERR_TAIL_LINES = 20
+
+# Read buffer for the stderr pipe; pip logs are read in 64 KiB blocks
+PIPE_BUFFER_SIZE = 1 << 16
+
+
 def run_command(command: str, description: str) -> bool:
-    """Run a command and return success status."""
+    """Run a command and return success status.
+
+    stdout streams straight to the terminal; only the last few stderr lines
+    are kept, so long pip/spacy downloads show progress without being
+    buffered in memory.
+    """
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             command.split(),
-            capture_output=True,
+            stderr=subprocess.PIPE,
             text=True,
-            check=True
+            bufsize=PIPE_BUFFER_SIZE
         )
-        print(f"✅ {description} completed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed:")
-        print(f"Error: {e.stderr}")
-        return False
     except FileNotFoundError:
         print(f"❌ Command not found: {command.split()[0]}")
         return False
+    
+    tail = deque(proc.stderr, maxlen=STDERR_TAIL_LINES)
+    if proc.wait() != 0:
+        print(f"❌ {description} failed:")
+        print(f"Error: {''.join(tail)}")
+        return False
+    
+    print(f"✅ {description} completed successfully")
+    return True
 
 
 def check_current_installation():
@@ -5,80 +5,120 @@ Migration management script for OCR Identity REST API
 
 import os
 import sys
-import subprocess
 from pathlib import Path
+from typing import Callable
 
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
-def run_command(command: str, description: str = "") -> bool:
-    """Run a command and return success status"""
-    print(f"🔄 {description or command}")
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, pool
+
+# Alembic and the app settings are loaded once in this process; migrations/env.py
+# reuses the same parsed configuration for every command
+ALEMBIC_CONFIG = Config(str(project_root / "alembic.ini"))
+
+
+def run_command(action: Callable[[], object], description: str) -> bool:
+    """Run an Alembic command in process and return success status"""
+    print(f"🔄 {description}")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout)
+        action()
         return True
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Error: {e}")
-        if e.stderr:
-            print(f"STDERR: {e.stderr}")
         return False
 
 
 def check_database_connection() -> bool:
     """Check if database is accessible"""
     print("🔍 Checking database connection...")
-    return run_command(
-        "python -c \"from app.core.config import get_config; print('Database config loaded successfully')\"",
-        "Testing database configuration"
-    )
+
+    def load_config():
+        from app.core.config import get_config
+        get_config()
+        print("Database config loaded successfully")
+
+    return run_command(load_config, "Testing database configuration")
 
 
 def init_migrations() -> bool:
     """Initialize Alembic migrations"""
     print("📝 Initializing Alembic migrations...")
-    return run_command("alembic init migrations", "Initializing Alembic")
+    return run_command(lambda: command.init(ALEMBIC_CONFIG, "migrations"), "Initializing Alembic")
 
 
 def create_migration(message: str) -> bool:
     """Create a new migration"""
     print(f"📝 Creating migration: {message}")
-    return run_command(f"alembic revision --autogenerate -m '{message}'", f"Creating migration: {message}")
+    return run_command(
+        lambda: command.revision(ALEMBIC_CONFIG, message=message, autogenerate=True),
+        f"Creating migration: {message}"
+    )
+
+
+def is_at_head() -> bool:
+    """Return True when the database is already at every script head"""
+    from app.core.config import get_config
+
+    engine = create_engine(get_config().database.database_url, poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            current = set(MigrationContext.configure(connection).get_current_heads())
+    finally:
+        engine.dispose()
+    return current == set(ScriptDirectory.from_config(ALEMBIC_CONFIG).get_heads())
 
 
 def upgrade_database(revision: str = "head") -> bool:
     """Upgrade database to specified revision"""
+    if revision == "head":
+        print("🔄 Checking current database revision")
+        try:
+            at_head = is_at_head()
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            return False
+        if at_head:
+            print("✅ Database is already at head; nothing to upgrade")
+            return True
+
     print(f"⬆️  Upgrading database to {revision}...")
-    return run_command(f"alembic upgrade {revision}", f"Upgrading database to {revision}")
+    return run_command(lambda: command.upgrade(ALEMBIC_CONFIG, revision), f"Upgrading database to {revision}")
 
 
 def downgrade_database(revision: str) -> bool:
     """Downgrade database to specified revision"""
     print(f"⬇️  Downgrading database to {revision}...")
-    return run_command(f"alembic downgrade {revision}", f"Downgrading database to {revision}")
+    return run_command(lambda: command.downgrade(ALEMBIC_CONFIG, revision), f"Downgrading database to {revision}")
 
 
 def show_migration_history() -> bool:
     """Show migration history"""
     print("📋 Migration history:")
-    return run_command("alembic history", "Showing migration history")
+    return run_command(lambda: command.history(ALEMBIC_CONFIG), "Showing migration history")
 
 
 def show_current_revision() -> bool:
     """Show current database revision"""
     print("📍 Current database revision:")
-    return run_command("alembic current", "Showing current revision")
+    return run_command(lambda: command.current(ALEMBIC_CONFIG), "Showing current revision")
 
 
 def show_pending_migrations() -> bool:
     """Show pending migrations"""
     print("⏳ Pending migrations:")
-    return run_command("alembic heads", "Showing pending migrations")
+    return run_command(lambda: command.heads(ALEMBIC_CONFIG), "Showing pending migrations")
 
 
 def stamp_database(revision: str = "head") -> bool:
     """Stamp database with current revision without running migrations"""
     print(f"🏷️  Stamping database with {revision}...")
-    return run_command(f"alembic stamp {revision}", f"Stamping database with {revision}")
+    return run_command(lambda: command.stamp(ALEMBIC_CONFIG, revision), f"Stamping database with {revision}")
 
 
 def main():
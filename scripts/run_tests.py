@@ -9,11 +9,14 @@ Usage:
     python scripts/run_tests.py --coverage        # Run with coverage report
     python scripts/run_tests.py --watch           # Run in watch mode
     python scripts/run_tests.py --verbose         # Run with verbose output
+    python scripts/run_tests.py --jobs 4          # Run on 4 xdist workers
 """
 
+import os
 import sys
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 
 
@@ -23,6 +26,9 @@ def run_tests(args):
     # Base pytest command
     cmd = ["python", "-m", "pytest"]
     
+    # Skip writing .pyc files on every repeated run
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    
     # Add test path
     cmd.append("tests/")
     
@@ -40,6 +46,9 @@ def run_tests(args):
             "--cov-report=html",
             "--cov-fail-under=80"
         ])
+        # Use coverage.py's compiled tracer rather than the pure-Python one
+        # (needs the binary wheel, e.g. pip install "coverage[toml]")
+        env["COVERAGE_CORE"] = "ctrace"
     
     if args.watch:
         cmd = ["python", "-m", "pytest-watch", "--", "tests/"]
@@ -48,7 +57,16 @@ def run_tests(args):
         cmd.append("-v")
     
     if args.fast:
-        cmd.extend(["-x", "--tb=short"])
+        # A one-shot run gains nothing from the last-failed cache
+        cmd.extend(["-x", "--tb=short", "-p", "no:cacheprovider"])
+    
+    # Spread test files over one worker process per core when pytest-xdist
+    # is installed; every test builds its own in-memory database
+    if not args.watch and args.jobs != "0":
+        if importlib.util.find_spec("xdist") is not None:
+            cmd.extend(["-n", args.jobs or "auto", "--dist=loadfile"])
+        else:
+            print("ℹ️  pytest-xdist not installed, running tests serially (poetry add --group dev pytest-xdist)")
     
     # Add additional pytest options
     if args.pytest_args:
@@ -57,7 +75,7 @@ def run_tests(args):
     print(f"Running: {' '.join(cmd)}")
     
     try:
-        result = subprocess.run(cmd, check=True)
+        result = subprocess.run(cmd, check=True, env=env)
         print("\n✅ Tests passed!")
         return 0
     except subprocess.CalledProcessError as e:
@@ -79,6 +97,7 @@ Examples:
   python scripts/run_tests.py --watch           # Run in watch mode
   python scripts/run_tests.py --verbose         # Run with verbose output
   python scripts/run_tests.py --fast            # Stop on first failure
+  python scripts/run_tests.py --jobs 0          # Run serially
         """
     )
     
@@ -118,6 +137,12 @@ Examples:
         help="Stop on first failure"
     )
     
+    parser.add_argument(
+        "--jobs",
+        default=None,
+        help="Number of pytest-xdist workers (default: one per core, 0 to run serially)"
+    )
+    
     parser.add_argument(
         "pytest_args",
         nargs="*",
@@ -11,7 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.core.logging_config import setup_logging, get_logger
+from app.core.logging_config import setup_logging, get_logger, logging_config
 from app.core.config import get_config
 
 
@@ -43,15 +43,21 @@ def check_log_files():
         print("❌ Logs directory does not exist")
         return False
     
-    log_files = list(log_dir.glob("*.log"))
+    # One directory pass; the file type comes from the directory entry and
+    # only the size needs a stat call
+    with os.scandir(log_dir) as entries:
+        log_files = [
+            (entry.name, entry.stat().st_size)
+            for entry in entries
+            if entry.name.endswith(".log") and entry.is_file()
+        ]
     if not log_files:
         print("❌ No log files found")
         return False
     
     print(f"✅ Found {len(log_files)} log files:")
-    for log_file in log_files:
-        size = log_file.stat().st_size
-        print(f"   - {log_file.name} ({size} bytes)")
+    for name, size in log_files:
+        print(f"   - {name} ({size} bytes)")
     
     return True
 
@@ -78,9 +84,10 @@ def test_logging_configuration():
         "celery"
     ]
     
-    for logger_name in loggers_to_test:
-        logger = get_logger(logger_name)
-        logger.info(f"Test message from {logger_name}")
+    # Resolve every logger first so the lookups don't interleave with handler I/O
+    loggers = [get_logger(logger_name) for logger_name in loggers_to_test]
+    for logger_name, logger in zip(loggers_to_test, loggers):
+        logger.info("Test message from %s", logger_name)
     
     print("✅ Logging configuration test completed")
 
@@ -97,25 +104,27 @@ def create_sample_logs():
     task_logger = get_logger("app.tasks")
     db_logger = get_logger("app.database")
     
+    # Arguments are passed separately so records dropped by level are never formatted
+    
     # API logs
-    api_logger.info("GET /health - Status: 200 - Time: 0.002s")
-    api_logger.info("POST /auth/login - Status: 200 - Time: 0.150s")
-    api_logger.error("GET /invalid - Status: 404 - Time: 0.001s")
+    api_logger.info("%s %s - Status: %d - Time: %.3fs", "GET", "/health", 200, 0.002)
+    api_logger.info("%s %s - Status: %d - Time: %.3fs", "POST", "/auth/login", 200, 0.150)
+    api_logger.error("%s %s - Status: %d - Time: %.3fs", "GET", "/invalid", 404, 0.001)
     
     # Service logs
-    service_logger.info("S3 upload: test-image.jpg (1.2MB) - completed in 0.5s")
-    service_logger.info("Redis get: user_session_123 - completed in 0.001s")
-    service_logger.error("Email send failed: Connection timeout")
+    service_logger.info("S3 upload: %s (%.1fMB) - completed in %.1fs", "test-image.jpg", 1.2, 0.5)
+    service_logger.info("Redis get: %s - completed in %.3fs", "user_session_123", 0.001)
+    service_logger.error("Email send failed: %s", "Connection timeout")
     
     # Task logs
-    task_logger.info("Celery task: process_ocr_image started - task_id: abc123")
-    task_logger.info("Celery task: process_ocr_image completed - task_id: abc123 - duration: 2.5s")
-    task_logger.error("Celery task: process_ocr_image failed - task_id: abc123 - error: Model not found")
+    task_logger.info("Celery task: %s started - task_id: %s", "process_ocr_image", "abc123")
+    task_logger.info("Celery task: %s completed - task_id: %s - duration: %.1fs", "process_ocr_image", "abc123", 2.5)
+    task_logger.error("Celery task: %s failed - task_id: %s - error: %s", "process_ocr_image", "abc123", "Model not found")
     
     # Database logs
-    db_logger.info("Database transaction: SELECT users - completed in 0.003s")
-    db_logger.info("Database transaction: INSERT media - completed in 0.008s")
-    db_logger.error("Database error: Connection lost")
+    db_logger.info("Database transaction: %s - completed in %.3fs", "SELECT users", 0.003)
+    db_logger.info("Database transaction: %s - completed in %.3fs", "INSERT media", 0.008)
+    db_logger.error("Database error: %s", "Connection lost")
     
     print("✅ Sample log entries created")
 
@@ -138,6 +147,10 @@ def main():
         create_sample_logs()
         print()
         
+        # File writes happen on the QueueListener threads; drain them so the
+        # sizes reported below include every sample entry
+        logging_config.stop_listeners()
+        
         # Check log files
         if check_log_files():
             print("\n🎉 Logging setup completed successfully!")
@@ -5,6 +5,10 @@ MinIO setup script for bucket creation and configuration
 import os
 import sys
 import json
+import io
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
@@ -12,28 +16,68 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from app.core.config import get_s3_config
 
+# Transfers for the connection test; MinIO handles large single PUTs well,
+# so multipart only starts at 64 MiB
+TRANSFER_CONFIG = TransferConfig(max_concurrency=10, multipart_threshold=64 * 1024 * 1024)
+
+# Public-read bucket policy, serialized once; %s is the bucket name
+BUCKET_POLICY_TEMPLATE = json.dumps({
+    'Version': '2012-10-17',
+    'Statement': [
+        {
+            'Sid': 'PublicReadGetObject',
+            'Effect': 'Allow',
+            'Principal': '*',
+            'Action': 's3:GetObject',
+            'Resource': 'arn:aws:s3:::%s/*'
+        }
+    ]
+})
+
+# Placeholder objects that make the folder structure visible in the console
+FOLDERS = ('uploads/', 'thumbnails/', 'documents/', 'temp/')
+
+
+class _HashingWriter:
+    """Non-seekable download target that hashes the body instead of storing it"""
+    
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+    
+    def write(self, data: bytes) -> None:
+        self.sha256.update(data)
+
+
+@functools.lru_cache(maxsize=1)
+def _s3_client():
+    """Create the S3 client shared by the setup and the connection test"""
+    config = get_s3_config()
+    
+    session = boto3.Session(
+        aws_access_key_id=config.aws_access_key_id,
+        aws_secret_access_key=config.aws_secret_access_key,
+        region_name=config.region_name
+    )
+    
+    return session.client(
+        's3',
+        endpoint_url=config.endpoint_url,
+        use_ssl=config.use_ssl,
+        verify=config.verify_ssl,
+        config=Config(max_pool_connections=16, retries={'max_attempts': 3})
+    )
+
 
 def setup_minio_bucket():
     """Setup MinIO bucket and configuration"""
     try:
         config = get_s3_config()
-        
-        # Create S3 client
-        session = boto3.Session(
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.region_name
-        )
-        
-        s3_client = session.client(
-            's3',
-            endpoint_url=config.endpoint_url,
-            use_ssl=config.use_ssl,
-            verify=config.verify_ssl
-        )
+        s3_client = _s3_client()
         
         bucket_name = config.bucket_name
         
@@ -53,46 +97,31 @@ def setup_minio_bucket():
         
         # Set bucket policy for public read access (optional)
         try:
-            bucket_policy = {
-                'Version': '2012-10-17',
-                'Statement': [
-                    {
-                        'Sid': 'PublicReadGetObject',
-                        'Effect': 'Allow',
-                        'Principal': '*',
-                        'Action': 's3:GetObject',
-                        'Resource': f'arn:aws:s3:::{bucket_name}/*'
-                    }
-                ]
-            }
-            
             s3_client.put_bucket_policy(
                 Bucket=bucket_name,
-                Policy=json.dumps(bucket_policy)
+                Policy=BUCKET_POLICY_TEMPLATE % bucket_name
             )
             print(f"✅ Bucket policy set for '{bucket_name}'")
         except Exception as e:
             print(f"⚠️  Could not set bucket policy: {e}")
         
         # Create folder structure
-        folders = [
-            'uploads/',
-            'thumbnails/',
-            'documents/',
-            'temp/'
-        ]
-        
-        for folder in folders:
+        def create_folder(folder):
             try:
                 s3_client.put_object(
                     Bucket=bucket_name,
                     Key=folder,
-                    Body=''
+                    Body=b''
                 )
                 print(f"✅ Created folder '{folder}'")
             except Exception as e:
                 print(f"⚠️  Could not create folder '{folder}': {e}")
         
+        # The placeholders are independent, so send them over pooled
+        # connections at once instead of one round trip after another
+        with ThreadPoolExecutor(max_workers=len(FOLDERS)) as executor:
+            list(executor.map(create_folder, FOLDERS))
+        
         print(f"\n🎉 MinIO setup completed successfully!")
         print(f"📁 Bucket: {bucket_name}")
         print(f"🌐 Endpoint: {config.endpoint_url}")
@@ -112,39 +141,26 @@ def test_s3_connection():
     """Test S3 connection and permissions"""
     try:
         config = get_s3_config()
-        
-        session = boto3.Session(
-            aws_access_key_id=config.aws_access_key_id,
-            aws_secret_access_key=config.aws_secret_access_key,
-            region_name=config.region_name
-        )
-        
-        s3_client = session.client(
-            's3',
-            endpoint_url=config.endpoint_url,
-            use_ssl=config.use_ssl,
-            verify=config.verify_ssl
-        )
+        s3_client = _s3_client()
         
         # Test upload
         test_content = b"test file content"
         test_key = "test/connection-test.txt"
         
-        s3_client.put_object(
-            Bucket=config.bucket_name,
-            Key=test_key,
-            Body=test_content,
-            ContentType="text/plain"
-        )
-        
-        # Test download
-        response = s3_client.get_object(
-            Bucket=config.bucket_name,
-            Key=test_key
-        )
+        # The transfer manager reuses the shared client's connection pool
+        with create_transfer_manager(s3_client, TRANSFER_CONFIG) as transfer_manager:
+            transfer_manager.upload(
+                io.BytesIO(test_content),
+                config.bucket_name,
+                test_key,
+                extra_args={'ContentType': 'text/plain'}
+            ).result()
+            
+            # Test download; the body is hashed as it streams in rather than buffered whole
+            downloaded = _HashingWriter()
+            transfer_manager.download(config.bucket_name, test_key, downloaded).result()
         
-        downloaded_content = response['Body'].read()
-        if downloaded_content == test_content:
+        if downloaded.sha256.digest() == hashlib.sha256(test_content).digest():
             print("✅ S3 connection test successful")
             
             # Clean up test file
@@ -14,9 +14,10 @@ sys.path.insert(0, str(project_root))
 from app.core.celery_app import celery_app
 
 
-def start_worker(queue: str = "default", concurrency: int = 4, log_level: str = "INFO"):
+def start_worker(queue: str = "default", concurrency: int = 4, log_level: str = "INFO", pool: str = "prefork"):
     """Start Celery worker"""
     print(f"Starting Celery worker for queue: {queue}")
+    print(f"Pool: {pool}")
     print(f"Concurrency: {concurrency}")
     print(f"Log level: {log_level}")
     
@@ -24,6 +25,7 @@ def start_worker(queue: str = "default", concurrency: int = 4, log_level: str =
     celery_app.worker_main([
         "worker",
         "--loglevel", log_level,
+        "--pool", pool,
         "--concurrency", str(concurrency),
         "--queues", queue,
         "--hostname", f"worker@{queue}",
@@ -49,7 +51,9 @@ def main():
     parser.add_argument("--worker", action="store_true", help="Start worker")
     parser.add_argument("--beat", action="store_true", help="Start beat scheduler")
     parser.add_argument("--queue", default="default", help="Queue name")
-    parser.add_argument("--concurrency", type=int, default=4, help="Number of worker processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of worker processes or threads")
+    parser.add_argument("--pool", default="prefork", choices=["prefork", "threads", "solo"],
+                        help="Worker pool: prefork for CPU-bound OCR, threads for I/O-bound S3 work")
     parser.add_argument("--log-level", default="INFO", help="Log level")
     
     args = parser.parse_args()
@@ -57,7 +61,7 @@ def main():
     if args.beat:
         start_beat()
     elif args.worker:
-        start_worker(args.queue, args.concurrency, args.log_level)
+        start_worker(args.queue, args.concurrency, args.log_level, args.pool)
     else:
         print("Please specify --worker or --beat")
         sys.exit(1)
@@ -5,14 +5,14 @@ Test script for multi-database functionality
 import asyncio
 import sys
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncpg
 from app.core.multi_database_utils import get_multi_database_utils
-from app.core.database_session import multi_db_manager
-from app.core.config import get_multi_database_config
+from app.core.config import DatabaseConfig, get_multi_database_config
 
 
 def test_database_configuration():
@@ -49,25 +49,43 @@ def test_database_configuration():
     return True
 
 
+async def _probe_database(db_name: str, db_config: DatabaseConfig) -> Tuple[str, bool, Any]:
+    """Connect to one database and run SELECT 1; returns (name, ok, row or error)"""
+    try:
+        conn = await asyncpg.connect(db_config.database_url)
+        try:
+            row = await conn.fetchrow("SELECT 1 AS test")
+        finally:
+            await conn.close()
+        return db_name, True, row
+    except Exception as e:
+        return db_name, False, str(e)
+
+
+def _probe_databases(databases: Dict[str, DatabaseConfig]) -> List[Tuple[str, bool, Any]]:
+    """Probe every database at once; one event loop multiplexes all the sockets"""
+    async def probe_all():
+        return await asyncio.gather(*(
+            _probe_database(db_name, db_config) for db_name, db_config in databases.items()
+        ))
+    
+    return asyncio.run(probe_all())
+
+
 def test_database_connections():
     """Test database connections"""
     print("\n🔌 Testing database connections...")
     
-    utils = get_multi_database_utils()
-    databases = utils.get_configured_databases()
+    # Probe every configured database, reachable or not, so failures are reported
+    results = _probe_databases(get_multi_database_config().get_all_databases())
     
-    for db_name in databases:
-        try:
-            engine = multi_db_manager.get_engine(db_name)
-            with engine.connect() as conn:
-                result = conn.execute("SELECT 1 as test")
-                test_result = result.fetchone()
-                print(f"   ✅ {db_name}: Connected successfully (test query: {test_result[0]})")
-        except Exception as e:
-            print(f"   ❌ {db_name}: Connection failed - {str(e)}")
-            return False
+    for db_name, ok, detail in results:
+        if ok:
+            print(f"   ✅ {db_name}: Connected successfully (test query: {detail['test']})")
+        else:
+            print(f"   ❌ {db_name}: Connection failed - {detail}")
     
-    return True
+    return all(ok for _, ok, _ in results)
 
 
 def test_health_checks():
@@ -120,21 +138,18 @@ def test_query_execution():
     print("\n🔍 Testing query execution...")
     
     utils = get_multi_database_utils()
-    databases = utils.get_configured_databases()
-    
-    for db_name in databases:
-        try:
-            result = utils.execute_on_database(db_name, "SELECT current_database() as db_name")
-            if result:
-                db_name_result = result[0][0] if result[0] else "Unknown"
-                print(f"   ✅ {db_name}: Query executed successfully (database: {db_name_result})")
-            else:
-                print(f"   ⚠️  {db_name}: Query executed but no result")
-        except Exception as e:
-            print(f"   ❌ {db_name}: Query execution failed - {str(e)}")
-            return False
+    results = utils.execute_on_all_databases("SELECT current_database() as db_name")
+    
+    for db_name, result in results.items():
+        if isinstance(result, dict):
+            print(f"   ❌ {db_name}: Query execution failed - {result['error']}")
+        elif result:
+            db_name_result = result[0][0] if result[0] else "Unknown"
+            print(f"   ✅ {db_name}: Query executed successfully (database: {db_name_result})")
+        else:
+            print(f"   ⚠️  {db_name}: Query executed but no result")
     
-    return True
+    return not any(isinstance(result, dict) for result in results.values())
 
 
 def test_backup_information():
@@ -0,0 +1,43 @@
+"""
+Unit tests for the bounded in-process cache
+"""
+from app.utils.cache import BoundedCache
+
+
+class TestBoundedCache:
+    """Test cases for BoundedCache"""
+    
+    def test_evicts_oldest_entry_when_full(self):
+        """Test that the oldest entry is dropped once maxsize is reached"""
+        cache = BoundedCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+    
+    def test_lru_keeps_recently_read_entry(self):
+        """Test that with lru=True a hit protects the entry from eviction"""
+        cache = BoundedCache(2, lru=True)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+    
+    def test_set_replaces_existing_key(self):
+        """Test that re-setting a key does not evict another entry"""
+        cache = BoundedCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        
+        assert cache.get("a") == 10
+        assert cache.get("b") == 2
+        assert cache.get("missing", "default") == "default"
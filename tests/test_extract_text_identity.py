@@ -0,0 +1,59 @@
+"""
+Unit tests for the manual-pattern identity text extraction
+"""
+import pytest
+from app.services import extract_text_identity
+from app.services.extract_text_identity import ExtractionResult, IdentityDocumentExtractor
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    """Extractor without a spaCy service, so only the manual patterns run"""
+    monkeypatch.setattr(extract_text_identity, "get_spacy_extraction_service", None)
+    return IdentityDocumentExtractor()
+
+
+class TestNikExtraction:
+    """Test cases for NIK normalization and extraction"""
+    
+    def test_handle_nik_folds_letter_confusables(self, extractor):
+        """Test that O and I misread inside the NIK become digits"""
+        result = ExtractionResult()
+        extractor._handle_nik("NIK : 3171O34567890I23", result)
+        
+        assert result.nik == "3171034567890123"
+    
+    def test_handle_nik_keeps_zeros(self, extractor):
+        """Test that a NIK containing zeros is returned unchanged"""
+        result = ExtractionResult()
+        extractor._handle_nik("NIK : 3171000000000001", result)
+        
+        assert result.nik == "3171000000000001"
+    
+    def test_handle_nik_rejects_wrong_length(self, extractor):
+        """Test that a value that is not 16 digits is not taken as a NIK"""
+        result = ExtractionResult()
+        extractor._handle_nik("NIK : 31710000", result)
+        
+        assert result.nik is None
+    
+    def test_fallback_extracts_nik(self, extractor):
+        """Test the NIK end to end through the manual fallback"""
+        result = extractor._extract_with_fallback("NIK : 3171O34567890I23")
+        
+        assert result.nik == "3171034567890123"
+        assert result.extraction_method == "manual_pattern"
+
+
+class TestNormalizeText:
+    """Test cases for text normalization"""
+    
+    def test_keeps_zeros_and_letter_o(self, extractor):
+        """Test that digits and the letter O outside the NIK are left alone"""
+        text = extractor._normalize_text("Gol. Darah : O  RT 010")
+        
+        assert text == "Gol. Darah : O RT 010"
+    
+    def test_replaces_pipe_with_i(self, extractor):
+        """Test that a pipe misread for I is fixed in text"""
+        assert extractor._normalize_text("|SLAM") == "ISLAM"
@@ -0,0 +1,75 @@
+"""
+Unit tests for upload type and content validation
+"""
+import io
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from app.rules.validation_file_size_type import (
+    sniff_content_type,
+    validate_file_headers,
+    validate_file_size_type,
+)
+
+JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+def make_upload(content: bytes, content_type: str, filename: str = "document") -> UploadFile:
+    """Build an UploadFile the way FastAPI hands it to an endpoint"""
+    return UploadFile(
+        file=io.BytesIO(content),
+        size=len(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+class TestSniffContentType:
+    """Test cases for magic number detection"""
+    
+    def test_detects_jpeg(self):
+        """Test that a JPEG signature is recognised"""
+        assert sniff_content_type(JPEG_HEADER) == "image/jpeg"
+    
+    def test_detects_png(self):
+        """Test that a PNG signature is recognised"""
+        assert sniff_content_type(PNG_HEADER) == "image/png"
+    
+    def test_rejects_other_content(self):
+        """Test that non-image bytes are not matched"""
+        assert sniff_content_type(b"%PDF-1.7\n") is None
+
+
+class TestValidateFileHeaders:
+    """Test cases for validate_file_headers"""
+    
+    def test_rejects_spoofed_content_type(self):
+        """Test that non-image bytes declared as image/png get a 415"""
+        upload = make_upload(b"<?php echo 'not an image'; ?>", "image/png", "evil.png")
+        
+        with pytest.raises(HTTPException) as exc_info:
+            validate_file_headers(upload)
+        
+        assert exc_info.value.status_code == 415
+    
+    @pytest.mark.parametrize("content, content_type", [
+        (JPEG_HEADER + b"\x00" * 64, "image/jpeg"),
+        (PNG_HEADER + b"\x00" * 64, "image/png"),
+    ])
+    def test_accepts_real_images_and_rewinds(self, content, content_type):
+        """Test that real JPEG/PNG headers pass and the file is rewound"""
+        upload = make_upload(content, content_type)
+        
+        validate_file_headers(upload)
+        
+        assert upload.file.tell() == 0
+    
+    @pytest.mark.asyncio
+    async def test_empty_upload_passes_through(self):
+        """Test that an empty upload is left for the caller to reject with a 400"""
+        upload = make_upload(b"", "image/jpeg")
+        
+        validate_file_headers(upload)
+        
+        assert await validate_file_size_type(upload) == b""
@@ -70,7 +70,28 @@ class TestMediaManager:
         
         assert child_media.parent_id == parent_media.id
         assert child_media.parent == parent_media
-    
+
+    def test_create_and_attach(self, db_session, sample_user):
+        """Test creating media and attaching it in one transaction"""
+        media, mediable = MediaManager.create_and_attach(
+            db=db_session,
+            model=sample_user,
+            name="Upload",
+            file_name="upload.jpg",
+            disk="s3",
+            mime_type="image/jpeg",
+            size=2048,
+            created_by=sample_user.id,
+            group="profile"
+        )
+
+        assert media.id is not None
+        assert mediable.media_id == media.id
+        assert mediable.mediable_id == sample_user.id
+        assert mediable.mediable_type == "User"
+        assert mediable.group == "profile"
+        assert MediaManager.get_model_media(db_session, sample_user, group="profile") == [media]
+
     def test_delete_media(self, db_session, sample_media, sample_user):
         """Test soft deleting media"""
         result = MediaManager.delete_media(
@@ -83,6 +104,23 @@ class TestMediaManager:
         assert sample_media.deleted_at is not None
         assert sample_media.deleted_by == sample_user.id
     
+    def test_get_media_by_hash(self, db_session, sample_media, sample_user):
+        """Test finding live media by content hash"""
+        assert MediaManager.get_media_by_hash(db_session, "testhash123").id == sample_media.id
+        assert MediaManager.get_media_by_hash(db_session, "otherhash") is None
+        
+        MediaManager.delete_media(db_session, sample_media, deleted_by=sample_user.id)
+        assert MediaManager.get_media_by_hash(db_session, "testhash123") is None
+    
+    def test_get_media_by_file_name(self, db_session, sample_media, sample_user):
+        """Test finding live media by S3 key"""
+        found = MediaManager.get_media_by_file_name(db_session, sample_media.file_name)
+        assert found.id == sample_media.id
+        assert MediaManager.get_media_by_file_name(db_session, "uploads/missing.jpg") is None
+        
+        MediaManager.delete_media(db_session, sample_media, deleted_by=sample_user.id)
+        assert MediaManager.get_media_by_file_name(db_session, sample_media.file_name) is None
+    
     def test_attach_media_to_model(self, db_session, sample_user, sample_media):
         """Test attaching media to a model"""
         mediable = MediaManager.attach_media_to_model(
@@ -96,7 +134,36 @@ class TestMediaManager:
         assert mediable.mediable_id == sample_user.id
         assert mediable.mediable_type == "User"
         assert mediable.group == "profile"
-    
+
+    def test_bulk_attach(self, db_session, sample_user, sample_media):
+        """Test attaching several media to a model at once"""
+        media2 = MediaManager.create_media(
+            db=db_session,
+            name="Avatar",
+            file_name="avatar.jpg",
+            disk="local",
+            mime_type="image/jpeg",
+            size=512000,
+            created_by=sample_user.id
+        )
+
+        count = MediaManager.bulk_attach(
+            db=db_session,
+            model=sample_user,
+            media_list=[sample_media, media2],
+            group="gallery"
+        )
+
+        assert count == 2
+        gallery_media = MediaManager.get_model_media(db_session, sample_user, "gallery")
+        assert len(gallery_media) == 2
+        assert sample_media in gallery_media
+        assert media2 in gallery_media
+
+    def test_bulk_attach_empty(self, db_session, sample_user):
+        """Test bulk attaching an empty media list"""
+        assert MediaManager.bulk_attach(db_session, sample_user, []) == 0
+
     def test_detach_media_from_model(self, db_session, sample_user, sample_media):
         """Test detaching media from a model"""
         # First attach
@@ -188,7 +255,23 @@ class TestMediaManager:
         assert profile_media[0] == sample_media
         assert len(avatar_media) == 1
         assert avatar_media[0] == media2
-    
+
+    def test_get_model_media_eager(self, db_session, sample_user, sample_media):
+        """Test eager loading of media relationships"""
+        MediaManager.attach_media_to_model(
+            db=db_session,
+            model=sample_user,
+            media=sample_media,
+            group="profile"
+        )
+        db_session.expire_all()
+
+        media_list = MediaManager.get_model_media(db_session, sample_user, eager=True)
+
+        assert len(media_list) == 1
+        assert "mediables" in media_list[0].__dict__
+        assert media_list[0].mediables[0].group == "profile"
+
     def test_get_media_by_type_and_id(self, db_session, sample_user, sample_media):
         """Test getting media by type and ID"""
         # Attach media
@@ -266,6 +349,28 @@ class TestMediaManager:
         
         assert len(png_media) == 0
 
+    def test_get_media_by_type_paginated(self, db_session, sample_user, sample_media):
+        """Test keyset pagination of media by MIME type"""
+        media2 = MediaManager.create_media(
+            db=db_session,
+            name="Avatar",
+            file_name="avatar.jpg",
+            disk="local",
+            mime_type="image/jpeg",
+            size=512000,
+            created_by=sample_user.id
+        )
+        MediaManager.bulk_attach(db_session, sample_user, [sample_media, media2], "profile")
+
+        first_page = MediaManager.get_media_by_type(db_session, sample_user, "image/jpeg", limit=1)
+        second_page = MediaManager.get_media_by_type(
+            db_session, sample_user, "image/jpeg", limit=1, after_id=first_page[0].id
+        )
+
+        assert len(first_page) == 1
+        assert len(second_page) == 1
+        assert {first_page[0], second_page[0]} == {sample_media, media2}
+
 
 class TestConvenienceFunctions:
     """Test cases for convenience functions"""